@@ -75,10 +75,40 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def do_run_migrations(connection) -> None:
+    """
+    Ejecutar las migraciones sobre una conexión abierta
+    """
+    # Crear esquemas si no existen
+    create_schemas_if_not_exist(connection)
+
+    # Configurar contexto de Alembic
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        compare_server_default=True,
+        include_schemas=include_schemas
+    )
+
+    with context.begin_transaction():
+        print(f"📊 Modelos detectados: {len(target_metadata.tables)} tablas")
+        context.run_migrations()
+        print("✅ Migraciones completadas exitosamente")
+
+
 def run_migrations_online() -> None:
     """
     Ejecutar migraciones en modo 'online'
+    
+    Si quien invoca ya tiene una conexión (config.attributes['connection'], p. ej. los
+    scripts de scripts/database), se reutiliza en lugar de abrir un engine propio.
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+    
     database_url = settings.DATABASE_URL
     
     if not database_url or database_url.strip() == "":
@@ -94,22 +124,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        # Crear esquemas si no existen
-        create_schemas_if_not_exist(connection)
-
-        # Configurar contexto de Alembic
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            compare_type=True,
-            compare_server_default=True,
-            include_schemas=include_schemas
-        )
-
-        with context.begin_transaction():
-            print(f"📊 Modelos detectados: {len(target_metadata.tables)} tablas")
-            context.run_migrations()
-            print("✅ Migraciones completadas exitosamente")
+        do_run_migrations(connection)
 
 
 # === Ejecutar migraciones ===
@@ -0,0 +1,39 @@
+"""add pg_trgm search indexes on seguridad.usuario
+
+Revision ID: b7d3f2a91c10
+Revises: a28e4334ea4a
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f2a91c10'
+down_revision: Union[str, None] = 'a28e4334ea4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Corresponde a Usuario.__search_fields__
+SEARCH_FIELDS = ("nombres", "apellido_paterno", "apellido_materno", "email")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_FIELDS:
+        op.create_index(
+            f'ix_usuario_{column}_trgm',
+            'usuario',
+            [sa.text(f"lower({column}) gin_trgm_ops")],
+            unique=False,
+            schema='seguridad',
+            postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    for column in SEARCH_FIELDS:
+        op.drop_index(f'ix_usuario_{column}_trgm', table_name='usuario', schema='seguridad')
@@ -0,0 +1,54 @@
+"""add prefix, trigram and enum filter indexes on seguridad.usuario
+
+Revision ID: c4e8a1d5f3b2
+Revises: b7d3f2a91c10
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1d5f3b2'
+down_revision: Union[str, None] = 'b7d3f2a91c10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# StringFilter de UsuarioWhere que aún no tienen índice trigram (contains / endsWith)
+TRGM_FIELDS = ("dni", "telefono")
+# StringFilter usados con startsWith: lower(col) LIKE 'prefijo%' usa el B-tree text_pattern_ops
+PREFIX_FIELDS = ("email", "dni", "nombres", "apellido_paterno", "apellido_materno")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRGM_FIELDS:
+        op.create_index(
+            f'ix_usuario_{column}_trgm',
+            'usuario',
+            [sa.text(f"lower({column}) gin_trgm_ops")],
+            unique=False,
+            schema='seguridad',
+            postgresql_using='gin'
+        )
+    for column in PREFIX_FIELDS:
+        op.create_index(
+            f'ix_usuario_{column}_prefix',
+            'usuario',
+            [sa.text(f"lower({column}) text_pattern_ops")],
+            unique=False,
+            schema='seguridad'
+        )
+    # Filtros EnumFilter (equals / in) sobre estado y tipo
+    op.create_index('ix_usuario_estado_tipo', 'usuario', ['estado', 'tipo'], unique=False, schema='seguridad')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_usuario_estado_tipo', table_name='usuario', schema='seguridad')
+    for column in PREFIX_FIELDS:
+        op.drop_index(f'ix_usuario_{column}_prefix', table_name='usuario', schema='seguridad')
+    for column in TRGM_FIELDS:
+        op.drop_index(f'ix_usuario_{column}_trgm', table_name='usuario', schema='seguridad')
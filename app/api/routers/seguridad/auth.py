@@ -1,19 +1,18 @@
 # app/api/routers/auth.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.seguridad.auth_schemas import (
     LoginRequest, 
     LoginResponse,
     RefreshTokenRequest,
     RefreshTokenResponse,
-    SessionInfo,
     UserTokenInfo
 )
 from app.services.seguridad.auth_service import auth_service
-from app.core.database import get_database
+from app.core.deps import get_async_db
 
 router = APIRouter(
     prefix="/auth",
@@ -23,9 +22,10 @@ router = APIRouter(
 security = HTTPBearer()
 
 @router.post("/login", response_model=LoginResponse)
-def login(
+async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_database)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Iniciar sesión con username/email y contraseña
@@ -36,16 +36,20 @@ def login(
         - user: Información del usuario
         - expires_in: Tiempo de expiración en segundos
     """
+    remote_ip = request.client.host if request.client else None
     try:
-        return auth_service.login(db, login_data)
-    except HTTPException:
+        return await auth_service.login(db, login_data, remote_ip)
+    except HTTPException as exc:
+        # El límite por IP + usuario ya cortó antes de la BD: no contar otro intento
+        if exc.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+            raise
         # Manejar intento fallido si es necesario
-        auth_service.handle_failed_login(db, login_data.username_or_email)
+        await auth_service.handle_failed_login(db, login_data.username_or_email, remote_ip)
 
 @router.post("/refresh", response_model=RefreshTokenResponse)
-def refresh_token(
+async def refresh_token(
     refresh_data: RefreshTokenRequest,
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Renovar access token usando refresh token
@@ -54,12 +58,12 @@ def refresh_token(
         - access_token: Nuevo token JWT
         - expires_in: Tiempo de expiración en segundos
     """
-    result = auth_service.refresh_access_token(db, refresh_data.refresh_token)
+    result = await auth_service.refresh_access_token(db, refresh_data.refresh_token)
     return RefreshTokenResponse(**result)
 
 @router.get("/me", response_model=UserTokenInfo)
-def get_current_user_info(
-    db: Session = Depends(get_database),
+async def get_current_user_info(
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(security)
 ):
     """
@@ -67,63 +71,9 @@ def get_current_user_info(
     
     Requires: Token JWT válido
     """
-    usuario = auth_service.get_current_user(db, token.credentials)
+    usuario = await auth_service.get_current_user(db, token.credentials)
     
-    return UserTokenInfo(
-        id=usuario.id,
-        uuid=usuario.uuid,
-        username=usuario.username,
-        email=usuario.email,
-        nombres=usuario.nombres,
-        apellidos=usuario.apellidos,
-        tipo_usuario=usuario.tipo_usuario,
-        estado=usuario.estado,
-        puesto_id=usuario.puesto_id
-    )
-
-@router.get("/session", response_model=SessionInfo)
-def get_session_info(
-    db: Session = Depends(get_database),
-    token: str = Depends(security)
-):
-    """
-    Obtener información completa de la sesión actual
-    
-    Includes:
-        - User information
-        - Token expiration
-        - User permissions
-    """
-    from datetime import datetime
-    from app.core.permissions.utils import get_user_permissions
-    
-    usuario = auth_service.get_current_user(db, token.credentials)
-    
-    # Obtener información del token
-    token_info = auth_service.validate_token(token.credentials)
-    
-    # Obtener permisos del usuario
-    user_permissions = get_user_permissions(db, usuario)
-    
-    user_info = UserTokenInfo(
-        id=usuario.id,
-        uuid=usuario.uuid,
-        username=usuario.username,
-        email=usuario.email,
-        nombres=usuario.nombres,
-        apellidos=usuario.apellidos,
-        tipo_usuario=usuario.tipo_usuario,
-        estado=usuario.estado,
-        puesto_id=usuario.puesto_id
-    )
-    
-    return SessionInfo(
-        user=user_info,
-        token_expires_at=token_info["expires_at"],
-        session_created_at=datetime.utcnow(),  # Simplificado por ahora
-        permissions=user_permissions,
-        last_activity=usuario.ultimo_acceso or datetime.utcnow()
-    )
+    return auth_service.user_token_info(usuario)
 
 @router.post("/validate")
 def validate_token(
@@ -139,9 +89,9 @@ def validate_token(
     return auth_service.validate_token(token.credentials)
 
 @router.post("/logout")
-def logout(
+async def logout(
     token: str = Depends(security),
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Cerrar sesión (logout)
@@ -152,8 +102,8 @@ def logout(
     - Cerrar sesiones en la base de datos
     - Limpiar cookies del cliente
     """
-    # Verificar que el token sea válido
-    auth_service.get_current_user(db, token.credentials)
+    # Verificar que el token sea válido (y el usuario siga activo)
+    await auth_service.get_current_user_id(db, token.credentials)
     
     return {
         "message": "Logout exitoso",
@@ -29,6 +29,14 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "sgd_colca"
     DATABASE_USER: str = "sgd_user"
     DATABASE_PASSWORD: str = ""
+    
+    # Pool de conexiones
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    # Cache de SQL compilado de SQLAlchemy (formas de consulta distintas que se reutilizan)
+    DB_QUERY_CACHE_SIZE: int = 1200
 
     # === CONFIGURACIÓN DE GOOGLE CLOUD ===
     GOOGLE_CLOUD_PROJECT: str = ""
@@ -81,6 +89,28 @@ class Settings(BaseSettings):
         default=15,
         description="Duración del bloqueo en minutos tras intentos fallidos"
     )
+    FAILED_LOGIN_RATE_LIMIT: int = Field(
+        default=10,
+        description="Máximo de intentos fallidos por IP y usuario dentro de la ventana antes de responder 429 sin tocar la BD"
+    )
+    FAILED_LOGIN_WINDOW_SECONDS: int = Field(
+        default=60,
+        description="Ventana en segundos para el conteo de intentos fallidos por IP y usuario"
+    )
+    
+    # === CONFIGURACIÓN DE HASHING (ARGON2) ===
+    ARGON2_T: int = Field(
+        default=1,
+        description="Argon2: número de iteraciones (time_cost)"
+    )
+    ARGON2_M_KIB: int = Field(
+        default=47104,
+        description="Argon2: memoria en KiB (memory_cost, 46 MiB según OWASP)"
+    )
+    ARGON2_P: int = Field(
+        default=1,
+        description="Argon2: grado de paralelismo"
+    )
 
     class Config:
         env_file = ".env"
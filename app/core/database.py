@@ -12,12 +12,17 @@ import logging
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
-# Crear engine asíncrono
+# Crear engine asíncrono (AsyncAdaptedQueuePool dimensionado desde la configuración)
 async_database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 async_engine = create_async_engine(
     async_database_url,
     future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
     echo=settings.DEBUG
 )
 
@@ -9,7 +9,7 @@ from fastapi import Depends
 
 from app.core.database import get_db
 from app.repositories.seguridad.usuario_repository import UsuarioRepository, usuario_repository
-from app.services.seguridad.usuario_service import UsuarioService, create_usuario_service
+from app.services.seguridad.usuario_service import UsuarioService, create_usuario_service, usuario_service
 
 # ===== DEPENDENCIAS DE BASE DE DATOS =====
 
@@ -35,7 +35,11 @@ def get_usuario_service(
 ) -> UsuarioService:
     """
     Dependencia para obtener servicio de usuarios con inyección de repositorio
+    
+    Reutiliza la instancia única del módulo salvo que se inyecte otro repositorio.
     """
+    if repository is usuario_repository:
+        return usuario_service
     return create_usuario_service(repository)
 
 # ===== DEPENDENCIAS DE AUTENTICACIÓN =====
@@ -1,12 +1,31 @@
 # app/core/jwt.py
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from jose import JWTError, jwt, jwk
 from fastapi import HTTPException, status
 
 from app.core.config import settings
 
+@lru_cache(maxsize=8)
+def _get_signer(algorithm: str, key: str):
+    """
+    Clave de firma construida una sola vez por (algoritmo, clave)
+    
+    Evita que jose vuelva a parsear la clave (costoso en claves PEM RSA/EC)
+    en cada emisión de token
+    """
+    return jwk.construct(key, algorithm)
+
+@lru_cache(maxsize=8)
+def _get_verifier(algorithm: str, key: str):
+    """Clave de verificación construida una sola vez por (algoritmo, clave)"""
+    signer = _get_signer(algorithm, key)
+    if algorithm.startswith("HS"):
+        return signer
+    return signer.public_key()
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Crear un token JWT de acceso
@@ -34,7 +53,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     })
     
     # Crear y retornar token
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _get_signer(settings.ALGORITHM, settings.SECRET_KEY), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token(data: Dict[str, Any]) -> str:
@@ -50,7 +69,7 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
         "type": "refresh"
     })
     
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _get_signer(settings.ALGORITHM, settings.SECRET_KEY), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
@@ -69,7 +88,7 @@ def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
     """
     try:
         # Decodificar token
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _get_verifier(settings.ALGORITHM, settings.SECRET_KEY), algorithms=[settings.ALGORITHM])
         
         # Verificar tipo de token
         if payload.get("type") != token_type:
@@ -102,7 +121,7 @@ def decode_token_payload(token: str) -> Optional[Dict[str, Any]]:
     Decodificar token sin verificar (útil para debugging)
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _get_verifier(settings.ALGORITHM, settings.SECRET_KEY), algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
         return None
@@ -112,7 +131,7 @@ def is_token_expired(token: str) -> bool:
     Verificar si un token está expirado sin lanzar excepción
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _get_verifier(settings.ALGORITHM, settings.SECRET_KEY), algorithms=[settings.ALGORITHM])
         exp_timestamp = payload.get("exp")
         if exp_timestamp:
             exp_datetime = datetime.fromtimestamp(exp_timestamp)
@@ -126,7 +145,7 @@ def get_token_remaining_time(token: str) -> Optional[timedelta]:
     Obtener tiempo restante de un token
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _get_verifier(settings.ALGORITHM, settings.SECRET_KEY), algorithms=[settings.ALGORITHM])
         exp_timestamp = payload.get("exp")
         if exp_timestamp:
             exp_datetime = datetime.fromtimestamp(exp_timestamp)
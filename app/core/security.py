@@ -1,12 +1,49 @@
 # app/core/security.py
 
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
+import asyncio
+import os
 import secrets
 import string
 
-# Configuración del contexto de passwords
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+# Configuración del contexto de passwords (instancia única, parámetros fijados al importar)
+# Argon2id para hashes nuevos; bcrypt queda como esquema obsoleto verificable
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.ARGON2_T,
+    argon2__memory_cost=settings.ARGON2_M_KIB,
+    argon2__parallelism=settings.ARGON2_P,
+    argon2__digest_size=32,
+    argon2__salt_size=16
+)
+
+# Pool de procesos para el hashing (CPU intensivo) fuera del event loop; se crea
+# al primer uso para no lanzar procesos al importar (scripts, migraciones)
+_HASH_POOL: Optional[ProcessPoolExecutor] = None
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """
+    Obtener el pool de hashing, creándolo de forma perezosa
+    """
+    global _HASH_POOL
+    if _HASH_POOL is None:
+        _HASH_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _HASH_POOL
+
+def shutdown_hash_pool() -> None:
+    """
+    Cerrar el pool de hashing (si se llegó a crear); se llama al apagar la aplicación
+    """
+    global _HASH_POOL
+    if _HASH_POOL is not None:
+        _HASH_POOL.shutdown(wait=True)
+        _HASH_POOL = None
 
 def hash_password(password: str) -> str:
     """
@@ -14,12 +51,32 @@ def hash_password(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+async def hash_password_async(password: str) -> str:
+    """
+    Crear hash de una contraseña sin bloquear el event loop (en el pool de procesos)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_pool(), hash_password, password)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verificar si la contraseña coincide con el hash
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verificar una contraseña sin bloquear el event loop (en el pool de procesos)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_pool(), verify_password, plain_password, hashed_password)
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Verificar si el hash usa un esquema o parámetros obsoletos y debe regenerarse
+    """
+    return pwd_context.needs_update(hashed_password)
+
 def generate_random_password(length: int = 12) -> str:
     """
     Generar una contraseña aleatoria segura
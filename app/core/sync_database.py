@@ -0,0 +1,25 @@
+# app/core/sync_database.py
+"""
+Engine síncrono (psycopg2) para los scripts de administración de scripts/database
+
+La API usa únicamente el engine asíncrono de app.core.database; este módulo no se
+importa en tiempo de ejecución de la aplicación.
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+
+# executemany agrupado (INSERT multi-VALUES + execute_batch) para las cargas masivas
+# de init-db / seed-data en lugar de una ida y vuelta por fila
+engine = create_engine(
+    settings.DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://"),
+    executemany_mode="values_plus_batch",
+    executemany_batch_page_size=500,
+    insertmanyvalues_page_size=1000,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    echo=settings.DEBUG
+)
+
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
@@ -11,10 +11,13 @@ from fastapi.responses import JSONResponse
 import logging
 import time
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
+from app.core.security import shutdown_hash_pool
 
 # routers
+from app.api.routers.seguridad.auth import router as auth_router
 from app.api.routers.seguridad.usuario_routers import router as usuario_router
 
 # Configurar logging
@@ -50,6 +53,7 @@ async def lifespan(app: FastAPI):
     
     # === SHUTDOWN ===
     logger.info("Cerrando aplicación")
+    shutdown_hash_pool()
 
 # Crear aplicación FastAPI con lifespan
 app = FastAPI(
@@ -97,6 +101,22 @@ async def log_requests(request: Request, call_next):
 
 # === EXCEPTION HANDLERS ===
 
+@app.exception_handler(SQLAlchemyError)
+async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+    """
+    Manejador de errores de base de datos (los servicios no capturan estas excepciones)
+    """
+    logger.error(f"Error de base de datos: {exc}")
+    
+    return JSONResponse(
+        status_code=500,
+        content={
+            "message": "Error de base de datos",
+            "detail": str(exc) if settings.DEBUG else "Error interno",
+            "success": False
+        }
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """
@@ -116,6 +136,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 # === ROUTERS ===
 
 # Incluir routers de autenticación y usuarios
+app.include_router(auth_router, prefix="/api/v1")
 app.include_router(usuario_router, prefix="/api/v1")
 
 # === ENDPOINTS PRINCIPALES ===
@@ -0,0 +1,23 @@
+# app/models/mixins.py
+
+from typing import ClassVar, Dict
+from sqlalchemy import Column, Date, DateTime
+
+
+class DateFilterMixin:
+    """
+    Mixin para modelos con filtros por rango de fechas
+
+    Registra una sola vez (al definir la clase) las columnas de fecha del modelo
+    en __date_fields__, para que los servicios no las resuelvan en cada request.
+    """
+
+    __date_fields__: ClassVar[Dict[str, Column]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.__date_fields__ = {
+            name: column
+            for name, column in vars(cls).items()
+            if isinstance(column, Column) and isinstance(column.type, (Date, DateTime))
+        }
@@ -5,10 +5,13 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
+from app.models.mixins import DateFilterMixin
 
-class Usuario(Base):
+class Usuario(DateFilterMixin, Base):
     __tablename__ = "usuario"
     __table_args__ = {'schema': 'seguridad'}
+    # Campos de búsqueda libre (índices trigram GIN sobre lower(campo), ver migración)
+    __search_fields__ = ("nombres", "apellido_paterno", "apellido_materno", "email")
 
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()), nullable=False)
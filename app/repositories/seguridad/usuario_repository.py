@@ -1,12 +1,146 @@
 # app/repositories/seguridad/usuario_repository.py
 
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, case, func, false, or_, bindparam, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert
+
 from app.models.seguridad.usuario_model import Usuario
 from app.schemas.seguridad.usuario.usuario_schemas import UsuarioCreate, UsuarioUpdate
 from app.repositories.base_repository import BaseRepository
 
+# Consultas por id precompiladas (se compilan una vez y se reutilizan con distinto parámetro)
+_GET_STMT = lambda_stmt(lambda: select(Usuario).where(Usuario.id == bindparam("id")))
+_GET_AUTH_STATE_STMT = lambda_stmt(lambda: select(Usuario.id, Usuario.estado).where(Usuario.id == bindparam("id")))
+
 class UsuarioRepository(BaseRepository[Usuario, UsuarioCreate, UsuarioUpdate]):
     def __init__(self):
         super().__init__(Usuario)
 
+    async def create(self, db: AsyncSession, obj_in) -> Optional[Usuario]:
+        """
+        Crear usuario con INSERT ... ON CONFLICT DO NOTHING RETURNING (atómico)
+        
+        Retorna None si el email/DNI/UUID ya existe (el llamador decide el error)
+        """
+        obj_in_data = obj_in.model_dump() if hasattr(obj_in, 'model_dump') else dict(obj_in)
+        
+        stmt = (
+            insert(Usuario)
+            .values(**obj_in_data)
+            .on_conflict_do_nothing()
+            .returning(Usuario)
+        )
+        result = await db.execute(stmt)
+        usuario = result.scalar_one_or_none()
+        await db.commit()
+        return usuario
+
+    async def get_by_credentials(self, db: AsyncSession, username_or_email: str) -> Optional[Usuario]:
+        """Obtener usuario por identificador de login (el modelo no tiene username: se usa el email)"""
+        stmt = select(Usuario).where(Usuario.email == username_or_email)
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def check_conflicts(
+        self,
+        db: AsyncSession,
+        email: Optional[str] = None,
+        dni: Optional[str] = None,
+        exclude_uuid: Optional[str] = None
+    ) -> Tuple[bool, bool]:
+        """
+        Verificar en una sola consulta si el email y/o DNI ya están registrados
+        
+        Retorna (email_tomado, dni_tomado); exclude_uuid omite al propio usuario (actualización)
+        """
+        checks = {}
+        if email:
+            checks['email'] = Usuario.email == email
+        if dni:
+            checks['dni'] = Usuario.dni == dni
+        
+        if not checks:
+            return False, False
+        
+        stmt = select(*[
+            func.coalesce(func.bool_or(condition), false()).label(name)
+            for name, condition in checks.items()
+        ]).where(or_(*checks.values()))
+        
+        if exclude_uuid:
+            stmt = stmt.where(Usuario.uuid != exclude_uuid)
+        
+        row = (await db.execute(stmt)).one()._mapping
+        return bool(row.get('email', False)), bool(row.get('dni', False))
+
+    async def get(self, db: AsyncSession, user_id: int) -> Optional[Usuario]:
+        """Obtener usuario por ID interno (consulta precompilada)"""
+        result = await db.execute(_GET_STMT, {"id": user_id})
+        return result.scalar_one_or_none()
+
+    async def get_auth_state(self, db: AsyncSession, user_id: int) -> Optional[Tuple[int, str]]:
+        """Obtener solo (id, estado) del usuario, sin hidratar la entidad"""
+        result = await db.execute(_GET_AUTH_STATE_STMT, {"id": user_id})
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def actualizar_ultimo_acceso(self, db: AsyncSession, usuario: Usuario) -> Usuario:
+        """
+        Registrar login exitoso en un solo UPDATE ... RETURNING
+        
+        Fija ultimo_acceso, resetea intentos fallidos y desbloquea; retorna la entidad actualizada
+        """
+        stmt = (
+            update(Usuario)
+            .where(Usuario.id == usuario.id)
+            .values(
+                ultimo_acceso=func.timezone('UTC', func.now()),
+                intentos_fallidos=0,
+                bloqueado_hasta=None
+            )
+            .returning(Usuario)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        usuario = result.scalar_one()
+        await db.commit()
+        return usuario
+
+    async def registrar_intento_fallido(
+        self,
+        db: AsyncSession,
+        username_or_email: str,
+        max_attempts: int,
+        lockout_minutes: int
+    ) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        Registrar un intento de login fallido en un solo UPDATE ... RETURNING
+        
+        Incrementa intentos_fallidos y, al alcanzar max_attempts, fija bloqueado_hasta.
+        Retorna (intentos_fallidos, bloqueado_hasta) o None si el usuario no existe.
+        """
+        # bloqueado_hasta se guarda sin zona horaria, en UTC
+        now_utc = func.timezone('UTC', func.now())
+        
+        stmt = (
+            update(Usuario)
+            .where(Usuario.email == username_or_email)
+            .values(
+                intentos_fallidos=Usuario.intentos_fallidos + 1,
+                bloqueado_hasta=case(
+                    (Usuario.intentos_fallidos + 1 >= max_attempts, now_utc + timedelta(minutes=lockout_minutes)),
+                    else_=Usuario.bloqueado_hasta
+                )
+            )
+            .returning(Usuario.intentos_fallidos, Usuario.bloqueado_hasta)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        row = result.first()
+        await db.commit()
+        return tuple(row) if row else None
+
 # Instancia del repositorio para inyección de dependencias
 usuario_repository = UsuarioRepository()
\ No newline at end of file
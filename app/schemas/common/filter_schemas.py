@@ -1,6 +1,6 @@
 # app/schemas/common/filter_schemas.py
 
-from typing import Optional, List, Union, Any, TypeVar, Generic
+from typing import Optional, List, Union, Any, TypeVar, Generic, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -64,6 +64,11 @@ class BooleanFilter(BaseModel):
 class PaginationConfig(BaseModel):
     page: int = 1
     pageSize: int = 10
+    # "cursor": paginación por keyset (sin OFFSET); cursor es el nextCursor de la página anterior
+    mode: Literal["offset", "cursor"] = "offset"
+    cursor: Optional[str] = None
+    # None: contar en modo offset (total cacheado unos segundos), no contar en modo cursor
+    include_total_count: Optional[bool] = None
 
 # ----------------------------------------------------------------------
 # Resultado paginado genérico
@@ -73,13 +78,14 @@ DataType = TypeVar('DataType')
 
 class PaginatedResult(BaseModel, Generic[DataType]):
     data: List[DataType]        # datos de la página actual
-    total: int                  # total de registros después de filtros
-    inicio: int                 # índice del primer elemento (1-indexed)
-    fin: int                   # índice del último elemento
-    totalPages: int             # total de páginas
+    total: Optional[int] = None         # total de registros después de filtros (None si no se contó)
+    inicio: Optional[int] = None        # índice del primer elemento (1-indexed)
+    fin: Optional[int] = None          # índice del último elemento
+    totalPages: Optional[int] = None    # total de páginas
     hasNextPage: bool           # hay página siguiente
     hasPrevPage: bool           # hay página anterior
     currentPage: int            # página actual
+    nextCursor: Optional[str] = None    # cursor para la página siguiente (modo cursor)
     # Información adicional sobre el ordenamiento aplicado
     appliedSort: Optional[SortConfig] = None
 
@@ -8,11 +8,12 @@ T = TypeVar("T")
 
 class ListaResponse(BaseModel, Generic[T]):
     data: List[T]
-    total: int
-    inicio: int
-    fin: int
-    totalPages: int
+    total: Optional[int] = None
+    inicio: Optional[int] = None
+    fin: Optional[int] = None
+    totalPages: Optional[int] = None
     hasNextPage: bool
     hasPrevPage: bool
     currentPage: int
+    nextCursor: Optional[str] = None
     appliedSort: Optional[SortConfig] = None
@@ -1,6 +1,7 @@
 # app/schemas/seguridad/usuario_filter_schemas.py
 
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, Tuple
 from pydantic import BaseModel
 from app.schemas.common.filter_schemas import (
     StringFilter, 
@@ -37,9 +38,10 @@ class UsuarioSortableColumns:
     FECHA_ACTUALIZACION = "fecha_actualizacion"
     
     @classmethod
-    def get_all_columns(cls) -> List[str]:
-        """Retorna todas las columnas permitidas para ordenamiento"""
-        return [
+    @lru_cache(maxsize=1)
+    def get_all_columns(cls) -> Tuple[str, ...]:
+        """Retorna todas las columnas permitidas para ordenamiento (cacheado)"""
+        return (
             cls.ID,
             cls.UUID,
             cls.EMAIL,
@@ -55,7 +57,7 @@ class UsuarioSortableColumns:
             cls.ULTIMO_ACCESO,
             cls.FECHA_CREACION,
             cls.FECHA_ACTUALIZACION
-        ]
+        )
 
 # ✅ CORREGIDO: Definir UsuarioWhere sin herencia de BaseWhere
 class UsuarioWhere(BaseModel):
@@ -1,6 +1,7 @@
 # app/schemas/seguridad/usuario_summary_schemas.py
 
-from typing import List
+from functools import lru_cache
+from typing import Tuple
 from app.schemas.common.summary_schemas import SummaryRequest, SummaryResponse
 from app.schemas.seguridad.usuario.usuario_filter_schemas import UsuarioWhere
 
@@ -11,13 +12,14 @@ class UsuarioSummaryGroupableColumns:
     FECHA_CREACION = "fecha_creacion"  # Para resúmenes por mes/año
     
     @classmethod
-    def get_all_columns(cls) -> List[str]:
-        """Retorna todas las columnas permitidas para agrupación"""
-        return [
+    @lru_cache(maxsize=1)
+    def get_all_columns(cls) -> Tuple[str, ...]:
+        """Retorna todas las columnas permitidas para agrupación (cacheado)"""
+        return (
             cls.ESTADO,
             cls.TIPO,
             cls.FECHA_CREACION
-        ]
+        )
 
 # Request específico para resúmenes de usuarios
 class UsuarioSummaryRequest(SummaryRequest[UsuarioWhere]):
@@ -1,17 +1,23 @@
 # app/services/base_service.py
 
-from typing import Any, Type, TypeVar, Generic, List, Protocol
+from typing import Any, Callable, Final, Type, TypeVar, Generic, List, Protocol, Tuple
+from functools import lru_cache
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_, bindparam, literal, String
+from sqlalchemy.orm import defer
 from fastapi import HTTPException, status
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 
-from app.utils.filter_engine import FilterEngine
+from app.utils.filter_engine import FilterEngine, escape_like
 from app.utils.sort_engine import SortEngine
-from app.schemas.common.filter_schemas import BaseListParams, PaginationConfig
+from app.utils.model_columns import resolve_column
+from app.schemas.common.filter_schemas import BaseListParams, EnumFilter, PaginationConfig, StringFilter
 from app.schemas.common.sorting_schemas import SortConfig, SortUtils
+from app.schemas.common.summary_schemas import SummaryRequest, SummaryResponse
 from app.repositories.base_repository import IBaseRepository
+from app.services.base_summary_service import BaseSummaryService
 
 # Types genéricos
 ModelType = TypeVar('ModelType')
@@ -20,6 +26,32 @@ ResponseType = TypeVar('ResponseType', bound=BaseModel)
 CreateSchemaType = TypeVar('CreateSchemaType')
 UpdateSchemaType = TypeVar('UpdateSchemaType')
 
+# Paginación por defecto (compartida: no debe mutarse)
+_DEFAULT_PAGINATION: Final = PaginationConfig(page=1, pageSize=10)
+
+@lru_cache(maxsize=128)
+def _compile_search(model_class: Type[Any], fields: Tuple[str, ...]) -> Callable[[str], list]:
+    """Compila (una vez por modelo y campos) el constructor de condiciones de búsqueda"""
+    columns = [column for column in (resolve_column(model_class, name) for name in fields) if column is not None]
+    
+    if not columns:
+        return lambda search_term: []
+    
+    # Las expresiones lower(columna) se construyen una sola vez; por búsqueda solo
+    # cambia el valor del parámetro ligado (mismo SQL compilado entre requests)
+    lowered_columns = [func.lower(column) for column in columns]
+    
+    def build(search_term: str) -> list:
+        pattern = func.lower(bindparam('srch_q', f"%{escape_like(search_term)}%", type_=String))
+        return [or_(*[column.like(pattern, escape="\\") for column in lowered_columns])]
+    
+    return build
+
+@lru_cache(maxsize=64)
+def _has_applied_sort(response_class: Type[BaseModel]) -> bool:
+    """Indica (cacheado por clase) si el response expone el campo appliedSort"""
+    return 'appliedSort' in getattr(response_class, 'model_fields', {})
+
 class IBaseService(Protocol[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Interfaz/Protocolo para servicios base"""
     
@@ -84,13 +116,26 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC):
 
     async def exists_by_uuid(self, db: AsyncSession, uuid: str) -> bool:
         """Verificar si existe entidad por UUID"""
-        return await self.repository.exists_by_uuid(db, uuid)
+        return await self._exists_fast(db, uuid)
+
+    async def _exists_fast(self, db: AsyncSession, uuid: str) -> bool:
+        """Existencia por UUID sin hidratar la entidad (SELECT 1 ... LIMIT 1)"""
+        model_class = self.repository.model
+        if not hasattr(model_class, 'uuid'):
+            return False
+        
+        stmt = select(literal(1)).where(model_class.uuid == uuid).limit(1)
+        return await db.scalar(stmt) is not None
 
 class BaseListService(Generic[ModelType, WhereType, ResponseType]):
     """
     Servicio base asíncrono para operaciones de listado con filtros avanzados
     
     MANTIENE toda la funcionalidad de filtrado, ordenamiento y paginación existente
+    
+    NOTA: la búsqueda (build_search_conditions) usa lower(campo) LIKE lower(:srch_q);
+    los campos de búsqueda de cada modelo (__search_fields__) requieren el índice
+    trigram GIN sobre lower(campo) para no recorrer la tabla completa.
     """
     
     def __init__(self, repository: IBaseRepository[ModelType, Any, Any] = None):
@@ -105,68 +150,136 @@ class BaseListService(Generic[ModelType, WhereType, ResponseType]):
         allowed_sort_columns: List[str] = None,
         excluded_columns: List[str] = None
     ) -> ResponseType:
-        try:
-            # Crear consulta base - siempre seleccionar el modelo completo
-            stmt = select(model_class)
-            
-            # Aplicar filtros
-            if request.where:
-                stmt = FilterEngine.apply_filters(stmt, model_class, request.where)
-            
-            # Aplicar ordenamiento
-            if request.sort and not SortUtils.is_empty(request.sort):
+        # Crear consulta base - el modelo sin las columnas excluidas (no viajan en el SELECT)
+        stmt = select(model_class)
+        if excluded_columns:
+            stmt = stmt.options(*[
+                defer(column, raiseload=True)
+                for column in (resolve_column(model_class, name) for name in excluded_columns)
+                if column is not None
+            ])
+        
+        # Aplicar filtros
+        if request.where:
+            stmt = FilterEngine.apply_filters(stmt, model_class, request.where)
+        
+        has_sort = not SortUtils.is_empty(request.sort)
+        
+        # Aplicar ordenamiento
+        if has_sort:
+            try:
                 # Validar columnas permitidas si se especifican
                 if allowed_sort_columns:
                     SortEngine.validate_sortable_columns(model_class, request.sort, allowed_sort_columns)
                 
                 stmt = SortEngine.apply_sorting(stmt, model_class, request.sort)
-            
-            # Aplicar paginación
-            pagination = request.pagination or PaginationConfig(page=1, pageSize=10)
-            data, metadata = await FilterEngine.apply_pagination(db, stmt, pagination)
-            
-            # Preparar respuesta
-            response_data = {
-                "data": data,
-                **metadata
-            }
-            
-            # Agregar información de ordenamiento si está disponible en el response
-            if hasattr(response_class, '__fields__') and 'appliedSort' in response_class.__fields__:
-                if request.sort and not SortUtils.is_empty(request.sort):
-                    response_data["appliedSort"] = request.sort
-            
-            return response_class(**response_data)
-            
-        except Exception as e:
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+        
+        # Aplicar paginación
+        pagination = request.pagination or _DEFAULT_PAGINATION
+        count_stmt = self._build_count_stmt(stmt, model_class)
+        try:
+            data, metadata = await FilterEngine.apply_pagination(
+                db, stmt, pagination, count_stmt=count_stmt,
+                model_class=model_class, sort_config=request.sort
+            )
+        except ValueError as e:
+            # Cursor de paginación inválido
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error al obtener lista de entidades: {str(e)}"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
             )
+        
+        # Preparar respuesta
+        response_data = {
+            "data": data,
+            **metadata
+        }
+        
+        # Agregar información de ordenamiento si está disponible en el response
+        if has_sort and _has_applied_sort(response_class):
+            response_data["appliedSort"] = request.sort
+        
+        return response_class(**response_data)
+
+    async def lista_y_resumen(
+        self,
+        db: AsyncSession,
+        model_class: Type[ModelType],
+        list_request: BaseListParams[WhereType],
+        summary_request: SummaryRequest[WhereType],
+        response_class: Type[ResponseType],
+        allowed_sort_columns: List[str] = None,
+        allowed_group_columns: List[str] = None,
+        excluded_columns: List[str] = None
+    ) -> Tuple[ResponseType, SummaryResponse]:
+        """
+        Obtiene lista y resumen del mismo modelo de forma concurrente
+        
+        AsyncSession no admite uso concurrente: cada consulta usa su propia sesión
+        de corta duración sobre el mismo engine (y su pool de conexiones)
+        """
+        async def _lista():
+            async with AsyncSession(bind=db.bind, expire_on_commit=False) as session:
+                return await self.lista_entidades(
+                    session, model_class, list_request, response_class, allowed_sort_columns,
+                    excluded_columns
+                )
+        
+        async def _resumen():
+            async with AsyncSession(bind=db.bind, expire_on_commit=False) as session:
+                return await BaseSummaryService().generar_resumen(
+                    session, model_class, summary_request, allowed_group_columns
+                )
+        
+        async with asyncio.TaskGroup() as tg:
+            lista_task = tg.create_task(_lista())
+            resumen_task = tg.create_task(_resumen())
+        
+        return lista_task.result(), resumen_task.result()
+
+    @staticmethod
+    def _build_count_stmt(stmt, model_class: Type[ModelType]):
+        """Construye el conteo sobre la tabla con solo los filtros del statement (sin ORDER BY ni columnas)"""
+        count_stmt = select(func.count()).select_from(model_class)
+        if stmt.whereclause is not None:
+            count_stmt = count_stmt.where(stmt.whereclause)
+        return count_stmt
 
     def validate_pagination(self, pagination: PaginationConfig) -> PaginationConfig:
-        """Valida y corrige parámetros de paginación"""
-        if pagination.page < 1:
-            pagination.page = 1
-        
-        if pagination.pageSize < 1:
-            pagination.pageSize = 10
-        elif pagination.pageSize > 1000:  # Límite máximo
-            pagination.pageSize = 1000
+        """Valida y corrige parámetros de paginación (sin mutar la configuración recibida)"""
+        page = max(pagination.page, 1)
+        page_size = pagination.pageSize
+        
+        if page_size < 1:
+            page_size = 10
+        elif page_size > 1000:  # Límite máximo
+            page_size = 1000
+        
+        if page == pagination.page and page_size == pagination.pageSize:
+            return pagination
+        
+        # model_copy conserva mode/cursor/include_total_count de la configuración recibida
+        corrected = pagination.model_copy(update={"page": page, "pageSize": page_size})
+        if corrected == _DEFAULT_PAGINATION:
+            return _DEFAULT_PAGINATION
             
-        return pagination
+        return corrected
     
     async def build_search_conditions(self, model_class: Type[ModelType], search_term: str, search_fields: list[str]) -> list:
         """Construye condiciones de búsqueda para campos específicos"""
-        from sqlalchemy import or_
-        
-        conditions = []
-        for field_name in search_fields:
-            if hasattr(model_class, field_name):
-                field = getattr(model_class, field_name)
-                conditions.append(field.ilike(f"%{search_term}%"))
-        
-        return [or_(*conditions)] if conditions else []
+        return _compile_search(model_class, tuple(search_fields))(search_term)
+
+_QUICK_FIELDS = frozenset({'nombres', 'estado'})
+
+@lru_cache(maxsize=64)
+def _quick_fields_of(where_class: type) -> frozenset:
+    """Campos de filtro rápido soportados por la clase del where (cacheado por clase)"""
+    return _QUICK_FIELDS.intersection(getattr(where_class, 'model_fields', {}))
 
 class CommonListService:
     """Servicios comunes para listados (mantenido sin cambios)"""
@@ -174,11 +287,15 @@ class CommonListService:
     @staticmethod
     def build_quick_filters(where_obj: Any, search_term: str = None, active_only: bool = False):
         """Construye filtros rápidos comunes"""
-        if search_term and hasattr(where_obj, 'nombres'):
-            where_obj.nombres = {"contains": search_term}
+        quick_filters = {
+            'nombres': StringFilter(contains=search_term) if search_term else None,
+            'estado': EnumFilter(equals="ACTIVO") if active_only else None
+        }
         
-        if active_only and hasattr(where_obj, 'estado'):
-            where_obj.estado = {"equals": "ACTIVO"}
+        for field_name in _quick_fields_of(type(where_obj)):
+            value = quick_filters[field_name]
+            if value is not None:
+                setattr(where_obj, field_name, value)
         
         return where_obj
     
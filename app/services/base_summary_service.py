@@ -2,17 +2,30 @@
 
 from typing import Type, TypeVar, Generic, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, and_, select
+from sqlalchemy import func, and_, select, cast, literal, Numeric, String
 from fastapi import HTTPException, status
 from pydantic import BaseModel
 
 from app.utils.filter_engine import FilterEngine
+from app.utils.model_columns import resolve_column
 from app.schemas.common.summary_schemas import SummaryRequest, SummaryResponse, SummaryItem
 
 # Types genéricos
 ModelType = TypeVar('ModelType')
 WhereType = TypeVar('WhereType')
 
+def _group_label(column, default: str):
+    """
+    Expresión de la etiqueta del grupo y conversión pendiente en Python
+    
+    Solo las columnas de texto/enum se resuelven en SQL (COALESCE); para el resto
+    se mantiene str() en Python, porque el CAST a texto de PostgreSQL cambia la
+    etiqueta (booleanos como true/false, fechas en formato de PostgreSQL).
+    """
+    if isinstance(column.type, String):
+        return func.coalesce(column, literal(default)), None
+    return column, lambda value: str(value) if value is not None else default
+
 class BaseSummaryService(Generic[ModelType, WhereType]):
     """
     Servicio base asíncrono para generar resúmenes agrupados
@@ -27,76 +40,67 @@ class BaseSummaryService(Generic[ModelType, WhereType]):
         request: SummaryRequest[WhereType],
         allowed_group_columns: List[str] = None
     ) -> SummaryResponse:
-        try:
-            # Validar columna de agrupación
-            if allowed_group_columns and request.groupBy not in allowed_group_columns:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Columna '{request.groupBy}' no permitida para agrupación. "
-                           f"Columnas permitidas: {allowed_group_columns}"
-                )
-            
-            # Verificar que la columna existe en el modelo
-            if not hasattr(model_class, request.groupBy):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Columna '{request.groupBy}' no existe en el modelo"
-                )
-            
-            # Obtener la columna para agrupar
-            group_column = getattr(model_class, request.groupBy)
-            
-            # Crear consulta base para el conteo total
-            total_stmt = select(func.count(model_class.id))
-            
-            # Crear consulta para agrupación
-            group_stmt = select(
-                group_column.label('group'),
-                func.count(model_class.id).label('count')
-            ).group_by(group_column)
-            
-            # Aplicar filtros si existen
-            if request.where:
-                total_stmt = FilterEngine.apply_filters(total_stmt, model_class, request.where)
-                group_stmt = FilterEngine.apply_filters(group_stmt, model_class, request.where)
-            
-            # Aplicar rango de fechas si existe
-            if hasattr(request, 'dateRange') and request.dateRange:
-                date_conditions = self._build_date_conditions(model_class, request.dateRange)
-                if date_conditions:
-                    total_stmt = total_stmt.where(and_(*date_conditions))
-                    group_stmt = group_stmt.where(and_(*date_conditions))
-            
-            # Ejecutar consultas asíncronamente
-            total_result = await db.execute(total_stmt)
-            total = total_result.scalar() or 0
-            
-            group_result = await db.execute(group_stmt)
-            groups_data = group_result.fetchall()
-            
-            # Preparar grupos para respuesta
-            groups = []
-            for row in groups_data:
-                groups.append(SummaryItem(
-                    group=str(row.group) if row.group is not None else "Sin clasificar",
-                    count=row.count
-                ))
-            
-            # Ordenar por conteo descendente por defecto
-            groups.sort(key=lambda x: x.count, reverse=True)
-            
-            return SummaryResponse(
-                total=total,
-                groups=groups
+        # Validar columna de agrupación
+        if allowed_group_columns and request.groupBy not in allowed_group_columns:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Columna '{request.groupBy}' no permitida para agrupación. "
+                       f"Columnas permitidas: {allowed_group_columns}"
             )
-            
-        except HTTPException:
-            raise
-        except Exception as e:
+        
+        # Obtener la columna para agrupar (y verificar que existe en el modelo)
+        group_column = resolve_column(model_class, request.groupBy)
+        if group_column is None:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error al generar resumen: {str(e)}"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Columna '{request.groupBy}' no existe en el modelo"
+            )
+        
+        # Construir una sola vez el conjunto filtrado (CTE) con filtros y rango de fechas
+        filtered_stmt = select(group_column)
+        
+        if request.where:
+            filtered_stmt = FilterEngine.apply_filters(filtered_stmt, model_class, request.where)
+        
+        if hasattr(request, 'dateRange') and request.dateRange:
+            date_conditions = self._build_date_conditions(model_class, request.dateRange)
+            if date_conditions:
+                filtered_stmt = filtered_stmt.where(and_(*date_conditions))
+        
+        filtered = filtered_stmt.cte('filtered')
+        filtered_group = filtered.c[group_column.name]
+        
+        # Consulta para el conteo total
+        total_stmt = select(func.count()).select_from(filtered)
+        
+        # Consulta para agrupación, ordenada por conteo descendente (en SQL)
+        group_label, to_label = _group_label(filtered_group, "Sin clasificar")
+        group_stmt = select(
+            group_label.label('group'),
+            func.count().label('count')
+        ).group_by(filtered_group).order_by(func.count().desc())
+        
+        # Ejecutar consultas asíncronamente
+        total_result = await db.execute(total_stmt)
+        total = total_result.scalar() or 0
+        
+        # Consumir los grupos en streaming (sin materializar todo el rowset)
+        group_result = await db.stream(group_stmt)
+        
+        # Preparar grupos para respuesta
+        # Etiquetas ya convertidas a texto: se omite la validación de pydantic
+        groups = [
+            SummaryItem.model_construct(
+                group=row.group if to_label is None else to_label(row.group),
+                count=row.count
             )
+            async for row in group_result
+        ]
+        
+        return SummaryResponse(
+            total=total,
+            groups=groups
+        )
 
     async def generar_resumen_personalizado(
         self,
@@ -109,70 +113,75 @@ class BaseSummaryService(Generic[ModelType, WhereType]):
         """
         Genera un resumen personalizado con más flexibilidad
         """
-        try:
-            if not hasattr(model_class, group_by_column):
-                raise ValueError(f"Columna '{group_by_column}' no existe en el modelo")
-            
-            group_column = getattr(model_class, group_by_column)
-            
-            # Crear consulta
-            stmt = select(
-                group_column.label('group'),
-                func.count(model_class.id).label('count')
-            ).group_by(group_column)
-            
-            # Aplicar filtros
-            if where_filters:
-                stmt = FilterEngine.apply_filters(stmt, model_class, where_filters)
-            
-            # Ordenamiento
-            if order_by_count:
-                stmt = stmt.order_by(func.count(model_class.id).desc())
-            
-            result = await db.execute(stmt)
-            data = result.fetchall()
-            
-            # Calcular total
-            total = sum(row.count for row in data)
-            
-            return {
-                "total": total,
-                "groups": [
-                    {
-                        "group": str(row.group) if row.group is not None else "Sin definir",
-                        "count": row.count,
-                        "percentage": round((row.count / total) * 100, 2) if total > 0 else 0
-                    }
-                    for row in data
-                ]
-            }
-            
-        except Exception as e:
+        group_column = resolve_column(model_class, group_by_column)
+        if group_column is None:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error al generar resumen personalizado: {str(e)}"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Columna '{group_by_column}' no existe en el modelo"
             )
+        
+        # Crear consulta
+        # El total y el porcentaje se calculan en SQL con una ventana sobre los conteos agrupados
+        group_count = func.count(model_class.id)
+        group_total = func.sum(group_count).over()
+        group_label, to_label = _group_label(group_column, "Sin definir")
+        stmt = select(
+            group_label.label('group'),
+            group_count.label('count'),
+            group_total.label('total'),
+            func.round(cast(100 * group_count, Numeric) / group_total, 2).label('pct')
+        ).group_by(group_column)
+        
+        # Aplicar filtros
+        if where_filters:
+            stmt = FilterEngine.apply_filters(stmt, model_class, where_filters)
+        
+        # Ordenamiento
+        if order_by_count:
+            stmt = stmt.order_by(group_count.desc())
+        
+        result = await db.stream(stmt)
+        
+        total = 0
+        groups = []
+        async for row in result:
+            total = int(row.total)
+            groups.append({
+                "group": row.group if to_label is None else to_label(row.group),
+                "count": row.count,
+                "percentage": float(row.pct)
+            })
+        
+        return {
+            "total": total,
+            "groups": groups
+        }
 
     def _build_date_conditions(self, model_class: Type[ModelType], date_range: Dict[str, Any]) -> List:
         """Construir condiciones de filtro por fechas"""
-        conditions = []
-        
         if not date_range:
-            return conditions
-        
-        date_field_name = date_range.get('field', 'fecha_creacion')
-        date_from = date_range.get('from')
-        date_to = date_range.get('to')
+            return []
         
-        if not hasattr(model_class, date_field_name):
-            return conditions
+        field_name = date_range.get('field', 'fecha_creacion')
+        date_fields = getattr(model_class, '__date_fields__', None)
         
-        date_field = getattr(model_class, date_field_name)
+        # Modelos con DateFilterMixin: columnas de fecha ya resueltas
+        if date_fields is not None:
+            date_field = date_fields.get(field_name)
+        else:
+            date_field = resolve_column(model_class, field_name)
         
-        if date_from:
-            conditions.append(date_field >= date_from)
+        if date_field is None:
+            return []
         
-        if date_to:
-            conditions.append(date_field <= date_to)
+        date_from = date_range.get('from')
+        date_to = date_range.get('to')
         
-        return conditions
+        return [
+            condition
+            for condition in (
+                date_field >= date_from if date_from else None,
+                date_field <= date_to if date_to else None
+            )
+            if condition is not None
+        ]
@@ -1,43 +1,105 @@
 # app/services/auth_service.py
 
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from cachetools import TTLCache
+import hashlib
+import time
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from app.models.seguridad.usuario_model import Usuario
 from app.schemas.seguridad.auth_schemas import LoginRequest, LoginResponse, UserTokenInfo
 from app.repositories.seguridad.usuario_repository import usuario_repository  # Esto debe ser la instancia
-from app.core.security import verify_password
+from app.core.security import hash_password, hash_password_async, verify_password_async, needs_rehash
 from app.core.jwt import create_access_token, create_refresh_token, verify_token
 from app.core.config import settings
 
+# Intentos fallidos recientes por (IP, hash del usuario), para cortar ataques antes de la BD
+_FAILED_ATTEMPTS: TTLCache = TTLCache(maxsize=100_000, ttl=settings.FAILED_LOGIN_WINDOW_SECONDS)
+
+# Hash de referencia para verificar contraseñas de usuarios inexistentes (tiempo constante)
+_DUMMY_HASH = hash_password("!invalid!")
+
 class AuthService:
+    # Máximo de tokens verificados en caché (LRU)
+    _TOKEN_CACHE_MAX = 4096
+    
     def __init__(self):
         self.usuario_repo = usuario_repository  # ✅ Instancia del repositorio
+        # Caché de tokens verificados: (tipo, sha256(token)) -> (payload, exp)
+        self._token_cache: OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], float]] = OrderedDict()
+
+    def _verify_cached(self, token: str, token_type: str) -> Dict[str, Any]:
+        """
+        Verificar token JWT usando una caché LRU de payloads ya verificados
+        
+        La clave usa el hash del token (no el token crudo) y nunca se
+        reutiliza un payload más allá de su expiración.
+        """
+        key = (token_type, hashlib.sha256(token.encode()).hexdigest())
+        
+        cached = self._token_cache.get(key)
+        if cached is not None:
+            payload, exp = cached
+            if time.time() < exp - 5:
+                self._token_cache.move_to_end(key)
+                return payload
+            del self._token_cache[key]
+        
+        payload = verify_token(token, token_type)
+        
+        self._token_cache[key] = (payload, payload["exp"])
+        if len(self._token_cache) > self._TOKEN_CACHE_MAX:
+            self._token_cache.popitem(last=False)
+        
+        return payload
 
-    def authenticate_user(self, db: Session, username_or_email: str, password: str) -> Optional[Usuario]:
+    async def authenticate_user(self, db: AsyncSession, username_or_email: str, password: str) -> Optional[Usuario]:
         """
         Autenticar usuario con username/email y contraseña
         """
         # Obtener usuario por credenciales
-        usuario = self.usuario_repo.get_by_credentials(db, username_or_email)
+        usuario = await self.usuario_repo.get_by_credentials(db, username_or_email)
         
-        if not usuario:
-            return None
+        # Verificar contraseña siempre (hash ficticio si el usuario no existe) para
+        # que la latencia no revele si el usuario existe
+        password_ok = await verify_password_async(password, usuario.password_hash if usuario else _DUMMY_HASH)
         
-        # Verificar contraseña
-        if not verify_password(password, usuario.password_hash):
+        if usuario is None or not password_ok:
             return None
         
+        # Actualizar de forma perezosa hashes con esquema/parámetros obsoletos
+        if needs_rehash(usuario.password_hash):
+            usuario.password_hash = await hash_password_async(password)
+            await db.commit()
+        
         return usuario
 
-    def login(self, db: Session, login_data: LoginRequest) -> LoginResponse:
+    @staticmethod
+    def _failed_attempts_key(username_or_email: str, remote_ip: Optional[str]) -> Tuple[Optional[str], str]:
+        """
+        Clave del contador de intentos fallidos: (IP, hash del usuario)
+        """
+        return (remote_ip, hashlib.sha256(username_or_email.lower().encode()).hexdigest())
+
+    async def login(self, db: AsyncSession, login_data: LoginRequest, remote_ip: Optional[str] = None) -> LoginResponse:
         """
         Realizar login y generar tokens
         """
+        # Cortar ráfagas por IP + usuario antes de consultar la BD y de verificar el hash
+        key = self._failed_attempts_key(login_data.username_or_email, remote_ip)
+        if _FAILED_ATTEMPTS.get(key, 0) >= settings.FAILED_LOGIN_RATE_LIMIT:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Demasiados intentos fallidos. Intente nuevamente más tarde.",
+                headers={"Retry-After": str(settings.FAILED_LOGIN_WINDOW_SECONDS)},
+            )
+        
         # Autenticar usuario
-        usuario = self.authenticate_user(
+        usuario = await self.authenticate_user(
             db, 
             login_data.username_or_email, 
             login_data.password
@@ -58,54 +120,66 @@ class AuthService:
             )
         
         # Verificar si está bloqueado
-        if usuario.bloqueado_hasta and usuario.bloqueado_hasta > datetime.utcnow():
-            tiempo_restante = usuario.bloqueado_hasta - datetime.utcnow()
-            minutos_restantes = int(tiempo_restante.total_seconds() / 60)
+        # bloqueado_hasta se guarda sin zona horaria, en UTC
+        bloqueado_hasta_ts = (
+            usuario.bloqueado_hasta.replace(tzinfo=timezone.utc).timestamp()
+            if usuario.bloqueado_hasta else 0.0
+        )
+        now_ts = time.time()
+        if bloqueado_hasta_ts > now_ts:
+            minutos_restantes = int((bloqueado_hasta_ts - now_ts) // 60)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Usuario bloqueado. Intente nuevamente en {minutos_restantes} minutos.",
             )
         
-        # Actualizar último acceso (resetea intentos fallidos)
-        usuario = self.usuario_repo.actualizar_ultimo_acceso(db, usuario)
+        # Actualizar último acceso (resetea intentos fallidos) con UPDATE ... RETURNING
+        usuario = await self.usuario_repo.actualizar_ultimo_acceso(db, usuario)
         
         # Crear tokens
         token_data = {
             "user_id": usuario.id,
-            "username": usuario.username,
-            "tipo_usuario": usuario.tipo_usuario
+            "username": usuario.email,
+            "tipo_usuario": usuario.tipo
         }
         
         access_token = create_access_token(token_data)
         refresh_token = create_refresh_token({"user_id": usuario.id})
         
-        # Crear respuesta
-        user_info = UserTokenInfo(
+        # Crear respuesta (datos del servicio ya validados: se omite la validación de pydantic)
+        return LoginResponse.model_construct(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer",
+            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # En segundos
+            user=self.user_token_info(usuario)
+        )
+
+    def user_token_info(self, usuario: Usuario) -> UserTokenInfo:
+        """
+        Construir la información de usuario del token desde la entidad
+        
+        El modelo no tiene username ni puesto: el login usa el email y los
+        apellidos se componen desde apellido_paterno/apellido_materno.
+        """
+        return UserTokenInfo.model_construct(
             id=usuario.id,
             uuid=usuario.uuid,
-            username=usuario.username,
+            username=usuario.email,
             email=usuario.email,
             nombres=usuario.nombres,
-            apellidos=usuario.apellidos,
-            tipo_usuario=usuario.tipo_usuario,
+            apellidos=f"{usuario.apellido_paterno} {usuario.apellido_materno}",
+            tipo_usuario=usuario.tipo,
             estado=usuario.estado,
-            puesto_id=usuario.puesto_id
-        )
-        
-        return LoginResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer",
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # En segundos
-            user=user_info
+            puesto_id=None
         )
 
-    def get_current_user(self, db: Session, token: str) -> Usuario:
+    def _get_user_id(self, token: str) -> int:
         """
-        Obtener usuario actual desde token JWT
+        Obtener user_id desde token JWT de acceso
         """
         # Verificar y decodificar token
-        payload = verify_token(token, "access")
+        payload = self._verify_cached(token, "access")
         
         # Obtener user_id del payload
         user_id = payload.get("user_id")
@@ -116,31 +190,55 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Obtener usuario de la base de datos
-        usuario = self.usuario_repo.get(db, user_id)
-        if not usuario:
+        return user_id
+
+    def _check_estado(self, estado: Optional[str]) -> None:
+        """
+        Verificar que el usuario exista (estado no nulo) y siga activo
+        """
+        if estado is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuario no encontrado",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Verificar que el usuario siga activo
-        if usuario.estado != "ACTIVO":
+        if estado != "ACTIVO":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuario inactivo",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+
+    async def get_current_user_id(self, db: AsyncSession, token: str) -> int:
+        """
+        Validar token y usuario activo sin cargar la entidad (solo id y estado)
+        """
+        user_id = self._get_user_id(token)
+        
+        auth_state = await self.usuario_repo.get_auth_state(db, user_id)
+        self._check_estado(auth_state[1] if auth_state else None)
+        
+        return user_id
+
+    async def get_current_user(self, db: AsyncSession, token: str) -> Usuario:
+        """
+        Obtener usuario actual desde token JWT (entidad completa)
+        """
+        user_id = self._get_user_id(token)
+        
+        # Obtener usuario de la base de datos
+        usuario = await self.usuario_repo.get(db, user_id)
+        self._check_estado(usuario.estado if usuario else None)
         
         return usuario
 
-    def refresh_access_token(self, db: Session, refresh_token: str) -> Dict[str, Any]:
+    async def refresh_access_token(self, db: AsyncSession, refresh_token: str) -> Dict[str, Any]:
         """
         Renovar access token usando refresh token
         """
         # Verificar refresh token
-        payload = verify_token(refresh_token, "refresh")
+        payload = self._verify_cached(refresh_token, "refresh")
         
         user_id = payload.get("user_id")
         if not user_id:
@@ -151,7 +249,7 @@ class AuthService:
             )
         
         # Obtener usuario
-        usuario = self.usuario_repo.get(db, user_id)
+        usuario = await self.usuario_repo.get(db, user_id)
         if not usuario or usuario.estado != "ACTIVO":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -162,8 +260,8 @@ class AuthService:
         # Crear nuevo access token
         token_data = {
             "user_id": usuario.id,
-            "username": usuario.username,
-            "tipo_usuario": usuario.tipo_usuario
+            "username": usuario.email,
+            "tipo_usuario": usuario.tipo
         }
         
         new_access_token = create_access_token(token_data)
@@ -174,23 +272,25 @@ class AuthService:
             "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         }
 
-    def handle_failed_login(self, db: Session, username_or_email: str):
+    async def handle_failed_login(self, db: AsyncSession, username_or_email: str, remote_ip: Optional[str] = None):
         """
         Manejar intento de login fallido
         """
-        usuario = self.usuario_repo.get_by_credentials(db, username_or_email)
+        # Contar el intento por IP + usuario; login() responde 429 al superar el límite
+        key = self._failed_attempts_key(username_or_email, remote_ip)
+        _FAILED_ATTEMPTS[key] = _FAILED_ATTEMPTS.get(key, 0) + 1
         
-        if usuario:
-            # Incrementar intentos fallidos
-            usuario = self.usuario_repo.incrementar_intentos_fallidos(db, usuario)
-            
-            # Bloquear si excede el máximo
-            if usuario.intentos_fallidos >= settings.MAX_LOGIN_ATTEMPTS:
-                lockout_until = datetime.utcnow() + timedelta(
-                    minutes=settings.LOCKOUT_DURATION_MINUTES
-                )
-                self.usuario_repo.bloquear_usuario(db, usuario, lockout_until)
-                
+        # Un solo UPDATE ... RETURNING: incrementa intentos y bloquea si excede el máximo
+        resultado = await self.usuario_repo.registrar_intento_fallido(
+            db,
+            username_or_email,
+            max_attempts=settings.MAX_LOGIN_ATTEMPTS,
+            lockout_minutes=settings.LOCKOUT_DURATION_MINUTES
+        )
+        
+        if resultado is not None:
+            intentos_fallidos, _ = resultado
+            if intentos_fallidos >= settings.MAX_LOGIN_ATTEMPTS:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail=f"Demasiados intentos fallidos. Usuario bloqueado por {settings.LOCKOUT_DURATION_MINUTES} minutos.",
@@ -208,7 +308,7 @@ class AuthService:
         Validar token y retornar información básica
         """
         try:
-            payload = verify_token(token, "access")
+            payload = self._verify_cached(token, "access")
             return {
                 "valid": True,
                 "user_id": payload.get("user_id"),
@@ -20,6 +20,7 @@ from app.schemas.seguridad.usuario.usuario_summary_schemas import (
 )
 from app.schemas.seguridad.usuario.usuario_schemas import UsuarioCreate, UsuarioUpdate
 from app.schemas.common.sorting_schemas import SortUtils
+from app.core.security import hash_password_async
 
 from app.repositories.seguridad.usuario_repository import UsuarioRepository, usuario_repository
 
@@ -30,39 +31,27 @@ class UsuarioService(
     BaseSummaryService[Usuario, UsuarioWhere]
 ):
     def __init__(self, repository: UsuarioRepository = usuario_repository):
-        # Llamar al constructor de BaseService con el repositorio
-        super(BaseService, self).__init__()  # Solo inicializar BaseListService y BaseSummaryService
+        # Las bases solo guardan el repositorio: se asigna directamente, sin recorrer el MRO
         self.repository = repository
 
     # ===== OPERACIONES CRUD ASÍNCRONAS =====
     
     async def crear_usuario(self, db: AsyncSession, obj_in: UsuarioCreate) -> Usuario:
         """Crear un nuevo usuario con contraseña encriptada"""
-        from app.core.security import hash_password
+        # Procesar datos y encriptar contraseña
+        obj_in_data = obj_in.model_dump(exclude={'password'})
+        obj_in_data['password_hash'] = await hash_password_async(obj_in.password)
         
-        # Verificar si el email ya existe
-        existing_user = await self.repository.get_by_email(db, obj_in.email)
-        if existing_user:
+        # Inserción atómica: solo si hay conflicto se consulta cuál campo lo causó
+        usuario = await self.repository.create(db, obj_in_data)
+        if usuario is None:
+            await self._validar_unicidad(db, obj_in.email, obj_in.dni)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="El email ya está registrado"
+                detail="El usuario ya está registrado"
             )
         
-        # Verificar si el DNI ya existe (si se proporciona)
-        if obj_in.dni:
-            existing_dni = await self.repository.get_by_dni(db, obj_in.dni)
-            if existing_dni:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="El DNI ya está registrado"
-                )
-        
-        # Procesar datos y encriptar contraseña
-        obj_in_data = obj_in.model_dump()
-        password = obj_in_data.pop('password')
-        obj_in_data['password_hash'] = hash_password(password)
-        
-        return await self.repository.create(db, obj_in_data)
+        return usuario
 
     async def obtener_usuario(self, db: AsyncSession, uuid: str) -> Usuario:
         """Obtener usuario por UUID"""
@@ -70,12 +59,31 @@ class UsuarioService(
 
     async def actualizar_usuario(self, db: AsyncSession, uuid: str, obj_in: UsuarioUpdate) -> Usuario:
         """Actualizar usuario por UUID"""
+        await self._validar_unicidad(db, obj_in.email, obj_in.dni, exclude_uuid=uuid)
         return await self.update_by_uuid(db, uuid, obj_in)
 
     async def eliminar_usuario(self, db: AsyncSession, uuid: str) -> bool:
         """Eliminar usuario por UUID"""
         return await self.delete_by_uuid(db, uuid)
 
+    async def _validar_unicidad(self, db: AsyncSession, email: str = None, dni: str = None, exclude_uuid: str = None):
+        """Validar que email y DNI no estén registrados por otro usuario"""
+        email_tomado, dni_tomado = await self.repository.check_conflicts(
+            db, email=email, dni=dni, exclude_uuid=exclude_uuid
+        )
+        
+        if email_tomado:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El email ya está registrado"
+            )
+        
+        if dni_tomado:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El DNI ya está registrado"
+            )
+
     # ===== OPERACIONES DE LISTADO Y RESUMEN =====
 
     async def lista_usuario(self, db: AsyncSession, request: UsuarioListaRequest) -> UsuarioListaResponse:
@@ -1,9 +1,17 @@
 # app/utils/filter_engine.py
 
-from typing import Any, List, Type
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple, Type, get_args
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import or_, and_, Column, select, func
-import math
+from sqlalchemy import or_, and_, Column, select, func, tuple_
+from datetime import date, datetime
+from decimal import Decimal
+from cachetools import TTLCache
+import base64
+import hashlib
+import json
+import logging
+import uuid
 
 from app.schemas.common.filter_schemas import (
     StringFilter,
@@ -13,6 +21,21 @@ from app.schemas.common.filter_schemas import (
     BooleanFilter,
     PaginationConfig
 )
+from app.schemas.common.sorting_schemas import SortConfig
+from app.utils.sort_engine import SortEngine
+from app.utils.model_columns import resolve_column
+
+logger = logging.getLogger(__name__)
+
+def escape_like(value: str) -> str:
+    """Escapa %, _ y la barra invertida para usarlos literalmente en LIKE ... ESCAPE '\\'"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# Campos de composición lógica de los BaseWhere (no son filtros de columna)
+_LOGICAL_FIELDS = frozenset({'AND', 'OR'})
+
+# Totales recientes por consulta de conteo (evita repetir el COUNT al paginar el mismo filtro)
+_COUNT_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=30)
 
 class FilterEngine:
     
@@ -21,38 +44,74 @@ class FilterEngine:
         """Aplicar filtros a un statement SQLAlchemy (asíncrono)"""
         if not where_filters:
             return stmt
+        
+        # Sin campos enviados (o solo AND/OR vacíos): nada que construir
+        fields_set = where_filters.model_fields_set
+        if not fields_set or (fields_set <= _LOGICAL_FIELDS and not where_filters.AND and not where_filters.OR):
+            return stmt
             
         conditions = FilterEngine._build_conditions(model_class, where_filters)
         
         if conditions:
-            # Si hay múltiples condiciones al nivel raíz, aplicar AND implícito
-            if len(conditions) == 1:
-                stmt = stmt.where(conditions[0])
-            else:
-                stmt = stmt.where(and_(*conditions))
+            # Lista plana: where(*conditions) las une con un único AND implícito
+            stmt = stmt.where(*conditions)
             
         return stmt
     
     @staticmethod
-    async def apply_pagination(db: AsyncSession, stmt, pagination: PaginationConfig) -> tuple[List[Any], dict]:
-        """Aplicar paginación asíncrona"""
-        # Contar total antes de paginación
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        result = await db.execute(count_stmt)
-        total = result.scalar()
-        
-        # Calcular offset
+    async def apply_pagination(
+        db: AsyncSession,
+        stmt,
+        pagination: PaginationConfig,
+        count_stmt=None,
+        model_class: Type[Any] = None,
+        sort_config: SortConfig = None
+    ) -> tuple[List[Any], dict]:
+        """
+        Aplicar paginación asíncrona
+        
+        count_stmt: consulta de conteo opcional (sin ORDER BY ni proyección); si no se
+        indica, se cuenta sobre una subconsulta del statement completo
+        model_class / sort_config: requeridos en modo cursor para derivar la clave del keyset
+        """
+        if pagination.mode == "cursor":
+            return await FilterEngine._apply_keyset_pagination(
+                db, stmt, pagination, model_class, sort_config, count_stmt
+            )
+        
         page = pagination.page
         page_size = pagination.pageSize
         offset = (page - 1) * page_size
+        count_total = pagination.include_total_count is not False
         
-        # Aplicar paginación
-        stmt = stmt.offset(offset).limit(page_size)
-        result = await db.execute(stmt)
+        # Una fila extra indica si hay página siguiente sin depender del COUNT
+        result = await db.execute(stmt.offset(offset).limit(page_size + 1))
         data = result.scalars().all()
+        has_next = len(data) > page_size
+        data = data[:page_size]
+        
+        if not count_total:
+            metadata = {
+                "total": None,
+                "inicio": offset + 1 if data else 0,
+                "fin": offset + len(data),
+                "totalPages": None,
+                "hasNextPage": has_next,
+                "hasPrevPage": page > 1,
+                "currentPage": page
+            }
+            return data, metadata
+        
+        # Última página (y no vacía, o la primera): el total se deduce sin COUNT
+        if not has_next and (data or page == 1):
+            total = offset + len(data)
+        else:
+            if count_stmt is None:
+                count_stmt = select(func.count()).select_from(stmt.subquery())
+            total = await FilterEngine._cached_count(db, count_stmt)
         
         # Calcular metadata
-        total_pages = math.ceil(total / page_size) if total > 0 else 1
+        total_pages = (total + page_size - 1) // page_size if total > 0 else 1
         inicio = offset + 1 if total > 0 else 0
         fin = min(offset + page_size, total)
         
@@ -61,122 +120,322 @@ class FilterEngine:
             "inicio": inicio,
             "fin": fin,
             "totalPages": total_pages,
-            "hasNextPage": page < total_pages,
+            "hasNextPage": has_next,
             "hasPrevPage": page > 1,
             "currentPage": page
         }
         
         return data, metadata
     
+    @staticmethod
+    async def apply_pagination_stream(
+        db: AsyncSession,
+        stmt,
+        pagination: PaginationConfig,
+        yield_per: int = 1000
+    ) -> AsyncIterator[Any]:
+        """
+        Variante en streaming de la paginación offset (exportaciones / páginas grandes)
+        
+        Recorre la página con un cursor del servidor en lotes de yield_per filas, sin
+        materializar la lista completa ni calcular metadata
+        """
+        offset = (pagination.page - 1) * pagination.pageSize
+        stmt = stmt.offset(offset).limit(pagination.pageSize)
+        
+        result = await db.stream_scalars(stmt, execution_options={"yield_per": yield_per})
+        async for row in result:
+            yield row
+    
+    @staticmethod
+    async def _cached_count(db: AsyncSession, count_stmt) -> int:
+        """COUNT memoizado unos segundos por SQL + parámetros (mismas páginas del mismo filtro)"""
+        compiled = count_stmt.compile()
+        key = hashlib.sha256(
+            f"{compiled}|{sorted(compiled.params.items())!r}".encode()
+        ).hexdigest()
+        
+        total = _COUNT_CACHE.get(key)
+        if total is None:
+            total = (await db.execute(count_stmt)).scalar()
+            _COUNT_CACHE[key] = total
+        return total
+    
+    @staticmethod
+    async def _apply_keyset_pagination(
+        db: AsyncSession,
+        stmt,
+        pagination: PaginationConfig,
+        model_class: Type[Any],
+        sort_config: SortConfig,
+        count_stmt=None
+    ) -> tuple[List[Any], dict]:
+        """
+        Paginación por keyset: WHERE (orden, id) > (:valor, :id) LIMIT page_size + 1
+        
+        El costo por página no depende de la profundidad (sin OFFSET) y hasNextPage sale
+        de la fila extra, sin COUNT. El total solo se calcula con include_total_count=True.
+        """
+        page_size = pagination.pageSize
+        keys = SortEngine.get_keyset_columns(model_class, sort_config)
+        
+        # El total cuenta todo el filtro, no solo lo que queda después del cursor
+        if pagination.include_total_count and count_stmt is None:
+            count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+        
+        # Orden total: columnas de ordenamiento + clave primaria
+        stmt = stmt.order_by(None).order_by(*[
+            FilterEngine._keyset_order(column, descending)
+            for _, column, descending in keys
+        ])
+        
+        if pagination.cursor:
+            values = FilterEngine._decode_cursor(pagination.cursor, keys)
+            stmt = stmt.where(FilterEngine._keyset_predicate(keys, values))
+        
+        result = await db.execute(stmt.limit(page_size + 1))
+        data = result.scalars().all()
+        
+        has_next = len(data) > page_size
+        data = data[:page_size]
+        
+        total = None
+        total_pages = None
+        if pagination.include_total_count:
+            total = await FilterEngine._cached_count(db, count_stmt)
+            total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+        
+        metadata = {
+            "total": total,
+            "inicio": None,
+            "fin": None,
+            "totalPages": total_pages,
+            "hasNextPage": has_next,
+            "hasPrevPage": pagination.cursor is not None,
+            "currentPage": pagination.page,
+            "nextCursor": FilterEngine._encode_cursor(data[-1], keys) if has_next else None
+        }
+        
+        return data, metadata
+    
+    @staticmethod
+    def _is_nullable(column: Any) -> bool:
+        return getattr(column.expression, "nullable", True)
+    
+    @staticmethod
+    def _keyset_order(column: Any, descending: bool):
+        """
+        ORDER BY de una columna del keyset; en las que admiten NULL se fija NULLS LAST (ASC)
+        o NULLS FIRST (DESC), el mismo orden por defecto de PostgreSQL (NULL como el mayor)
+        """
+        if descending:
+            order = column.desc()
+            return order.nulls_first() if FilterEngine._is_nullable(column) else order
+        order = column.asc()
+        return order.nulls_last() if FilterEngine._is_nullable(column) else order
+    
+    @staticmethod
+    def _keyset_after(column: Any, value: Any, descending: bool):
+        """Condición "la columna va después de value" con NULL como el mayor; None si nada va después"""
+        if value is None:
+            # ASC NULLS LAST: tras un NULL no hay valores; DESC NULLS FIRST: siguen los no nulos
+            return column.is_not(None) if descending else None
+        if descending:
+            return column < value
+        if FilterEngine._is_nullable(column):
+            return or_(column > value, column.is_(None))
+        return column > value
+    
+    @staticmethod
+    def _keyset_predicate(keys: List[Tuple[str, Any, bool]], values: List[Any]):
+        """
+        Condición "después del cursor" respetando la dirección de cada columna
+        
+        Una comparación con NULL nunca es verdadera: las columnas que admiten NULL usan
+        ramas IS NULL / IS NOT NULL explícitas en lugar de la comparación de tuplas.
+        """
+        directions = {descending for _, _, descending in keys}
+        nullable = any(FilterEngine._is_nullable(column) for _, column, _ in keys)
+        
+        # Misma dirección y sin NULL posibles: comparación de tuplas (usa el índice compuesto)
+        if len(directions) == 1 and not nullable:
+            columns = tuple_(*[column for _, column, _ in keys])
+            return columns < tuple_(*values) if directions.pop() else columns > tuple_(*values)
+        
+        # General: (a después de x) OR (a = x AND b después de y) OR ...
+        branches = []
+        for i, (_, column, descending) in enumerate(keys):
+            step = FilterEngine._keyset_after(column, values[i], descending)
+            if step is None:
+                continue
+            prefix = [
+                keys[j][1].is_(None) if values[j] is None else keys[j][1] == values[j]
+                for j in range(i)
+            ]
+            branches.append(and_(*prefix, step))
+        return or_(*branches)
+    
+    @staticmethod
+    def _encode_cursor(row: Any, keys: List[Tuple[str, Any, bool]]) -> str:
+        """Cursor opaco (base64 de JSON) con los valores de la clave de la última fila"""
+        values = []
+        for name, _, _ in keys:
+            value = getattr(row, name)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif isinstance(value, (Decimal, uuid.UUID)):
+                value = str(value)
+            values.append(value)
+        
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str, keys: List[Tuple[str, Any, bool]]) -> List[Any]:
+        """Decodifica el cursor y convierte cada valor al tipo Python de su columna"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise ValueError("longitud de clave distinta")
+            
+            return [
+                FilterEngine._coerce_cursor_value(column, value)
+                for (_, column, _), value in zip(keys, values)
+            ]
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Cursor de paginación inválido: {str(e)}")
+    
+    @staticmethod
+    def _coerce_cursor_value(column: Any, value: Any) -> Optional[Any]:
+        if value is None:
+            return None
+        
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+        
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type in (Decimal, uuid.UUID):
+            return python_type(value)
+        return value
+    
     @staticmethod
     def _build_conditions(model_class: Type[Any], where_filters: Any) -> List[Any]:
+        """
+        Construye las condiciones del árbol AND/OR de forma iterativa (pila explícita)
+        
+        Los OR reservan un lugar en la lista de su padre y se cierran al final, de los más
+        internos a los externos, cuando ya se conocen las condiciones de cada rama
+        """
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("FilterEngine: where_filters=%r (%s)", where_filters, type(where_filters).__name__)
+        
         conditions = []
+        stack = [(where_filters, conditions)]
+        pending_or = []     # (lista destino, posición reservada, condiciones por rama)
         
-        print(f"🔧 FILTER ENGINE DEBUG:")
-        print(f"   - where_filters: {where_filters}")
-        print(f"   - where_filters type: {type(where_filters)}")
-        print(f"   - where_filters vars: {vars(where_filters) if hasattr(where_filters, '__dict__') else 'No vars'}")
-        
-        # Verificar AND/OR
-        has_and = hasattr(where_filters, 'AND') and where_filters.AND
-        has_or = hasattr(where_filters, 'OR') and where_filters.OR
-        print(f"   - Tiene AND: {has_and}")
-        print(f"   - Tiene OR: {has_or}")
-        
-        # Manejar AND anidado
-        if has_and:
-            print(f"   - Procesando AND...")
-            and_conditions = []
-            for and_condition in where_filters.AND:
-                sub_conditions = FilterEngine._build_conditions(model_class, and_condition)
-                if sub_conditions:
-                    # Si hay múltiples sub-condiciones, unirlas con AND
-                    if len(sub_conditions) == 1:
-                        and_conditions.append(sub_conditions[0])
-                    else:
-                        and_conditions.append(and_(*sub_conditions))
+        while stack:
+            node, target = stack.pop()
+            
+            # Manejar AND anidado: las sub-condiciones se fusionan en la lista del nivel actual
+            if getattr(node, 'AND', None):
+                # Apilar en orden inverso para procesar los hijos en su orden original
+                for and_condition in reversed(node.AND):
+                    stack.append((and_condition, target))
             
-            if and_conditions:
-                # Todas las condiciones AND deben cumplirse
-                if len(and_conditions) == 1:
-                    conditions.append(and_conditions[0])
-                else:
-                    conditions.append(and_(*and_conditions))
-        
-        # Manejar OR anidado
-        elif has_or:
-            print(f"   - Procesando OR...")
+            # Manejar OR anidado
+            elif getattr(node, 'OR', None):
+                branches = [[] for _ in node.OR]
+                pending_or.append((target, len(target), branches))
+                target.append(None)
+                for or_condition, branch in zip(reversed(node.OR), reversed(branches)):
+                    stack.append((or_condition, branch))
+            
+            # ✅ PROCESAR FILTROS INDIVIDUALES (cuando NO hay AND/OR)
+            else:
+                target.extend(FilterEngine.compile_for(model_class, type(node))(node))
+        
+        # Cerrar los OR de adentro hacia afuera
+        for target, slot, branches in reversed(pending_or):
             or_conditions = []
-            for or_condition in where_filters.OR:
-                sub_conditions = FilterEngine._build_conditions(model_class, or_condition)
-                if sub_conditions:
+            for branch in branches:
+                branch = [condition for condition in branch if condition is not None]
+                if branch:
                     # Si hay múltiples sub-condiciones en un OR, unirlas con AND
-                    if len(sub_conditions) == 1:
-                        or_conditions.append(sub_conditions[0])
-                    else:
-                        or_conditions.append(and_(*sub_conditions))
-            
-            if or_conditions:
-                # Al menos una de las condiciones OR debe cumplirse
-                conditions.append(or_(*or_conditions))
+                    or_conditions.append(branch[0] if len(branch) == 1 else and_(*branch))
+            # Al menos una de las condiciones OR debe cumplirse
+            target[slot] = or_(*or_conditions) if or_conditions else None
         
-        # ✅ PROCESAR FILTROS INDIVIDUALES (cuando NO hay AND/OR)
-        else:
-            print(f"   - Procesando filtros individuales...")
-            
-            for field_name, filter_value in vars(where_filters).items():
-                print(f"   - Campo: {field_name}, Valor: {filter_value}, Tipo: {type(filter_value)}")
-                
-                if field_name in ['AND', 'OR'] or filter_value is None:
-                    print(f"     -> Saltando campo {field_name}")
-                    continue
-                    
-                # Obtener el campo del modelo
-                if hasattr(model_class, field_name):
-                    model_field = getattr(model_class, field_name)
-                    print(f"     -> Campo del modelo encontrado: {model_field}")
-                    
-                    field_conditions = FilterEngine._apply_field_filter(model_field, filter_value)
-                    print(f"     -> Condiciones generadas: {field_conditions}")
-                    
-                    conditions.extend(field_conditions)
-                else:
-                    print(f"     -> Campo {field_name} NO encontrado en modelo {model_class}")
-        
-        print(f"   - Condiciones finales: {conditions}")
+        conditions = [condition for condition in conditions if condition is not None]
+        
+        if debug:
+            logger.debug("FilterEngine: condiciones finales=%s", conditions)
         return conditions
     
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def compile_for(model_class: Type[Any], where_class: Type[Any]) -> Callable[[Any], List[Any]]:
+        """
+        Compila (una vez por modelo y schema de filtros) el constructor de condiciones de hoja
+        
+        Resuelve de antemano, para cada campo declarado en el schema, la columna del modelo
+        y el constructor según el tipo de filtro declarado; por request solo se recorren los
+        campos enviados, sin resolución de columnas ni despacho por tipo.
+        """
+        plan = {}
+        for field_name, field_info in where_class.model_fields.items():
+            if field_name in _LOGICAL_FIELDS:
+                continue
+            
+            column = resolve_column(model_class, field_name)
+            if column is None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("FilterEngine: campo %s no encontrado en modelo %s", field_name, model_class.__name__)
+                continue
+            
+            # Optional[XFilter] -> constructor de XFilter; anotaciones no reconocidas se despachan por valor
+            declared = [t for t in (field_info.annotation, *get_args(field_info.annotation)) if t in _FILTER_DISPATCH]
+            plan[field_name] = (column, _FILTER_DISPATCH[declared[0]] if declared else FilterEngine._apply_field_filter)
+        
+        plan_fields = frozenset(plan)
+        
+        def build(where_filters: Any) -> List[Any]:
+            conditions = []
+            # Solo los campos enviados por el cliente; ordenados para que la misma forma de
+            # filtro genere siempre el mismo SQL (y reutilice el cache de compilación)
+            for field_name in sorted(where_filters.model_fields_set & plan_fields):
+                filter_value = getattr(where_filters, field_name)
+                if filter_value is not None:
+                    column, handler = plan[field_name]
+                    conditions.extend(handler(column, filter_value))
+            return conditions
+        
+        return build
+    
     @staticmethod
     def _apply_field_filter(model_field: Column, filter_obj: Any) -> List[Any]:
-        conditions = []
-        
-        print(f"🔧 APPLY FIELD FILTER:")
-        print(f"   - model_field: {model_field}")
-        print(f"   - filter_obj: {filter_obj}")
-        print(f"   - filter_obj type: {type(filter_obj)}")
-        
-        # Determinar tipo de filtro y aplicar
-        if isinstance(filter_obj, StringFilter):
-            print(f"   - Es StringFilter")
-            conditions.extend(FilterEngine._apply_string_filter(model_field, filter_obj))
-        elif isinstance(filter_obj, NumberFilter):
-            print(f"   - Es NumberFilter")
-            conditions.extend(FilterEngine._apply_number_filter(model_field, filter_obj))
-        elif isinstance(filter_obj, DateFilter):
-            print(f"   - Es DateFilter")
-            conditions.extend(FilterEngine._apply_date_filter(model_field, filter_obj))
-        elif isinstance(filter_obj, EnumFilter):
-            print(f"   - Es EnumFilter")
-            conditions.extend(FilterEngine._apply_enum_filter(model_field, filter_obj))
-        elif isinstance(filter_obj, BooleanFilter):
-            print(f"   - Es BooleanFilter")
-            conditions.extend(FilterEngine._apply_boolean_filter(model_field, filter_obj))
-        else:
-            print(f"   - Tipo de filtro NO RECONOCIDO: {type(filter_obj)}")
-        
-        print(f"   - Condiciones del campo: {conditions}")
-        return conditions
+        # Determinar tipo de filtro por búsqueda exacta en la tabla de despacho
+        filter_type = type(filter_obj)
+        handler = _FILTER_DISPATCH.get(filter_type)
+        
+        if handler is None:
+            # Subclases de los filtros base: se resuelven por MRO una sola vez y se memorizan
+            handler = next((_FILTER_DISPATCH[base] for base in filter_type.__mro__ if base in _FILTER_DISPATCH), None)
+            if handler is None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("FilterEngine: tipo de filtro no reconocido %s para %s", filter_type.__name__, model_field)
+                return []
+            _FILTER_DISPATCH[filter_type] = handler
+        
+        return handler(model_field, filter_obj)
     
+    # Las comparaciones contra valores (==, >, ilike, in_) generan bindparams anónimos tipados
+    # por la columna: filtros con la misma forma comparten la entrada del cache de SQL compilado
     @staticmethod
     def _apply_string_filter(field: Column, string_filter: StringFilter) -> List[Any]:
         conditions = []
@@ -184,24 +443,21 @@ class FilterEngine:
         if string_filter.equals is not None:
             conditions.append(field == string_filter.equals)
         
+        # lower(col) LIKE patrón_en_minúsculas: usa los índices funcionales sobre lower(col)
+        # (trigram GIN para contains/endsWith, B-tree text_pattern_ops para startsWith).
+        # % y _ del texto del usuario se escapan para que coincidan literalmente
         if string_filter.contains is not None:
-            conditions.append(field.ilike(f"%{string_filter.contains}%"))
+            conditions.append(func.lower(field).like(f"%{escape_like(string_filter.contains.lower())}%", escape="\\"))
         
         if string_filter.startsWith is not None:
-            conditions.append(field.ilike(f"{string_filter.startsWith}%"))
+            conditions.append(func.lower(field).like(f"{escape_like(string_filter.startsWith.lower())}%", escape="\\"))
         
         if string_filter.endsWith is not None:
-            conditions.append(field.ilike(f"%{string_filter.endsWith}"))
-        
-        # Verificar ambos atributos posibles para 'in'
-        in_value = None
-        if hasattr(string_filter, 'in_') and string_filter.in_ is not None:
-            in_value = string_filter.in_
-        elif hasattr(string_filter, 'in') and getattr(string_filter, 'in') is not None:
-            in_value = getattr(string_filter, 'in')
+            conditions.append(func.lower(field).like(f"%{escape_like(string_filter.endsWith.lower())}", escape="\\"))
         
-        if in_value is not None and len(in_value) > 0:
-            conditions.append(field.in_(in_value))
+        # 'in' llega siempre como in_ (alias del schema)
+        if string_filter.in_:
+            conditions.append(field.in_(string_filter.in_))
         
         return conditions
     
@@ -225,15 +481,9 @@ class FilterEngine:
         if number_filter.lte is not None:
             conditions.append(field <= number_filter.lte)
         
-        # Verificar ambos atributos posibles para 'in'
-        in_value = None
-        if hasattr(number_filter, 'in_') and number_filter.in_ is not None:
-            in_value = number_filter.in_
-        elif hasattr(number_filter, 'in') and getattr(number_filter, 'in') is not None:
-            in_value = getattr(number_filter, 'in')
-        
-        if in_value is not None and len(in_value) > 0:
-            conditions.append(field.in_(in_value))
+        # 'in' llega siempre como in_ (alias del schema)
+        if number_filter.in_:
+            conditions.append(field.in_(number_filter.in_))
         
         return conditions
     
@@ -257,15 +507,9 @@ class FilterEngine:
         if date_filter.lte is not None:
             conditions.append(field <= date_filter.lte)
         
-        # Verificar ambos atributos posibles para 'in'
-        in_value = None
-        if hasattr(date_filter, 'in_') and date_filter.in_ is not None:
-            in_value = date_filter.in_
-        elif hasattr(date_filter, 'in') and getattr(date_filter, 'in') is not None:
-            in_value = getattr(date_filter, 'in')
-        
-        if in_value is not None and len(in_value) > 0:
-            conditions.append(field.in_(in_value))
+        # 'in' llega siempre como in_ (alias del schema)
+        if date_filter.in_:
+            conditions.append(field.in_(date_filter.in_))
         
         return conditions
     
@@ -274,38 +518,15 @@ class FilterEngine:
         """Aplica filtros de enum"""
         conditions = []
         
-        print(f"🔧 ENUM FILTER DEBUG:")
-        print(f"   - field: {field}")
-        print(f"   - enum_filter: {enum_filter}")
-        print(f"   - enum_filter type: {type(enum_filter)}")
-        print(f"   - enum_filter vars: {vars(enum_filter)}")
-        
         if enum_filter.equals is not None:
-            print(f"   - Aplicando equals: {enum_filter.equals}")
             conditions.append(field == enum_filter.equals)
         
-        # Verificar ambos atributos posibles para 'in'
-        in_value = None
-        if hasattr(enum_filter, 'in_') and enum_filter.in_ is not None:
-            in_value = enum_filter.in_
-            print(f"   - Encontrado in_ con valor: {in_value}")
-        elif hasattr(enum_filter, 'in') and getattr(enum_filter, 'in') is not None:
-            in_value = getattr(enum_filter, 'in')
-            print(f"   - Encontrado in con valor: {in_value}")
-        else:
-            print(f"   - NO se encontró valor 'in' válido")
-            print(f"   - Tiene in_?: {hasattr(enum_filter, 'in_')}")
-            print(f"   - Valor in_: {getattr(enum_filter, 'in_', 'NO EXISTE')}")
-            print(f"   - Tiene in?: {hasattr(enum_filter, 'in')}")
-            print(f"   - Valor in: {getattr(enum_filter, 'in', 'NO EXISTE')}")
-        
-        if in_value is not None and len(in_value) > 0:
-            print(f"   - Aplicando IN con valores: {in_value}")
-            conditions.append(field.in_(in_value))
-        else:
-            print(f"   - NO se aplicará filtro IN (in_value: {in_value})")
+        # 'in' llega siempre como in_ (alias del schema)
+        if enum_filter.in_:
+            conditions.append(field.in_(enum_filter.in_))
         
-        print(f"   - Condiciones generadas: {conditions}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("FilterEngine: enum %s equals=%r in=%r -> %s", field, enum_filter.equals, enum_filter.in_, conditions)
         return conditions
     
     @staticmethod
@@ -317,3 +538,13 @@ class FilterEngine:
             conditions.append(field == boolean_filter.equals)
         
         return conditions
+
+
+# Tabla de despacho tipo de filtro -> constructor de condiciones
+_FILTER_DISPATCH = {
+    StringFilter: FilterEngine._apply_string_filter,
+    NumberFilter: FilterEngine._apply_number_filter,
+    DateFilter: FilterEngine._apply_date_filter,
+    EnumFilter: FilterEngine._apply_enum_filter,
+    BooleanFilter: FilterEngine._apply_boolean_filter,
+}
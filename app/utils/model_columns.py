@@ -0,0 +1,19 @@
+# app/utils/model_columns.py
+
+from functools import lru_cache
+from typing import Any, Optional, Type
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+@lru_cache(maxsize=256)
+def resolve_column(model_class: Type[Any], name: str) -> Optional[InstrumentedAttribute]:
+    """
+    Resolver (y cachear) la columna mapeada de un modelo por nombre
+
+    Reemplaza el par hasattr()/getattr() sobre el modelo: retorna None si
+    el nombre no corresponde a una columna mapeada.
+    """
+    if name not in model_class.__mapper__.columns:
+        return None
+    return getattr(model_class, name)
@@ -1,8 +1,10 @@
 # app/utils/sort_engine.py
 
-from typing import Type, List
+from typing import Any, Type, List, Tuple
+from functools import lru_cache
 from sqlalchemy import desc, asc
 from app.schemas.common.sorting_schemas import SortConfig, SortColumn, SortDirection, SortUtils
+from app.utils.model_columns import resolve_column
 
 class SortEngine:
     @staticmethod
@@ -12,44 +14,77 @@ class SortEngine:
             return stmt
         
         try:
-            for sort_column in sort_config:
-                column_attr = SortEngine._get_column_attribute(model_class, sort_column.column)
-                
-                if sort_column.direction == SortDirection.DESC:
-                    stmt = stmt.order_by(desc(column_attr))
-                else:
-                    stmt = stmt.order_by(asc(column_attr))
-            
-            return stmt
+            sort_spec = tuple((sort_column.column, sort_column.direction) for sort_column in sort_config)
+            return stmt.order_by(*SortEngine._order_by_clauses(model_class, sort_spec))
             
         except Exception as e:
             raise ValueError(f"Error al aplicar ordenamiento: {str(e)}")
     
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _order_by_clauses(model_class: Type, sort_spec: Tuple[Tuple[str, SortDirection], ...]) -> tuple:
+        """Expresiones ORDER BY (cacheadas por modelo y especificación de orden)"""
+        clauses = []
+        for column_name, direction in sort_spec:
+            column_attr = SortEngine._get_column_attribute(model_class, column_name)
+            clauses.append(desc(column_attr) if direction == SortDirection.DESC else asc(column_attr))
+        return tuple(clauses)
+    
     @staticmethod
     def _get_column_attribute(model_class: Type, column_name: str):      
-        if not hasattr(model_class, column_name):
-            raise AttributeError(f"El modelo {model_class.__name__} no tiene la columna '{column_name}'")
+        column_attr = resolve_column(model_class, column_name)
+        if column_attr is None:
+            raise ValueError(f"El modelo {model_class.__name__} no tiene la columna '{column_name}'")
+        
+        return column_attr
+    
+    @staticmethod
+    def get_keyset_columns(model_class: Type, sort_config: SortConfig) -> List[Tuple[str, Any, bool]]:
+        """
+        Clave de keyset del orden aplicado: (nombre, atributo, descendente) por columna,
+        con la clave primaria al final como desempate para que el orden sea total
+        """
+        keys = []
+        if not SortUtils.is_empty(sort_config):
+            for sort_column in sort_config:
+                column_attr = SortEngine._get_column_attribute(model_class, sort_column.column)
+                keys.append((sort_column.column, column_attr, sort_column.direction == SortDirection.DESC))
+        
+        mapper = model_class.__mapper__
+        pk_name = mapper.get_property_by_column(mapper.primary_key[0]).key
+        if not any(name == pk_name for name, _, _ in keys):
+            keys.append((pk_name, getattr(model_class, pk_name), False))
         
-        return getattr(model_class, column_name)
+        return keys
     
     @staticmethod
     def validate_sortable_columns(model_class: Type, sort_config: SortConfig, allowed_columns: List[str] = None) -> bool:        
         if SortUtils.is_empty(sort_config):
             return True
         
+        # Columnas ordenables = permitidas ∩ columnas del modelo (cacheado por combinación)
+        sortable = SortEngine._sortable_set(model_class, tuple(allowed_columns)) if allowed_columns else None
+        
         for sort_column in sort_config:
             column_name = sort_column.column
+            if sortable is not None and column_name in sortable:
+                continue
             
             # Verificar si la columna existe en el modelo
-            if not hasattr(model_class, column_name):
+            if resolve_column(model_class, column_name) is None:
                 raise ValueError(f"La columna '{column_name}' no existe en el modelo {model_class.__name__}")
             
             # Verificar si la columna está en la lista de columnas permitidas
-            if allowed_columns and column_name not in allowed_columns:
+            if sortable is not None:
                 raise ValueError(f"La columna '{column_name}' no está permitida para ordenamiento")
         
         return True
     
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _sortable_set(model_class: Type, allowed_columns: Tuple[str, ...]) -> frozenset:
+        return frozenset(allowed_columns) & frozenset(model_class.__mapper__.columns.keys())
+    
     @staticmethod
     def create_default_sort(column: str, direction: SortDirection = SortDirection.ASC) -> SortConfig:       
         return [SortColumn(column=column, direction=direction)]
@@ -60,9 +95,15 @@ class SortEngine:
         if SortUtils.is_empty(sort_config):
             return ""
         
+        return SortEngine._order_by_string(
+            tuple((sort_column.column, sort_column.direction) for sort_column in sort_config)
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _order_by_string(sort_spec: Tuple[Tuple[str, SortDirection], ...]) -> str:
         order_parts = []
-        for sort_column in sort_config:
-            direction = "DESC" if sort_column.direction == SortDirection.DESC else "ASC"
-            order_parts.append(f"{sort_column.column} {direction}")
+        for column_name, direction in sort_spec:
+            order_parts.append(f"{column_name} {'DESC' if direction == SortDirection.DESC else 'ASC'}")
         
         return f"ORDER BY {', '.join(order_parts)}"
\ No newline at end of file
@@ -7,6 +7,7 @@ Punto de entrada para comandos de administración
 
 import sys
 import argparse
+from functools import lru_cache
 from pathlib import Path
 
 # Agregar directorio raíz al path
@@ -37,7 +38,8 @@ def seed_data_command(args):
     success = seed_test_data(
         include_users=args.users,
         include_extended_org=args.extended_org,
-        scenario=args.scenario
+        scenario=args.scenario,
+        dev_hash=args.dev_hash
     )
     
     if success:
@@ -60,7 +62,7 @@ def reset_db_command(args):
             return 1
     
     print("🔄 Reseteando base de datos...")
-    success = reset_database(reinit=args.reinit)
+    success = reset_database(reinit=args.reinit, mode=args.mode)
     
     if success:
         print("\n✅ Base de datos reseteada correctamente")
@@ -78,7 +80,12 @@ def backup_db_command(args):
     success = create_backup(
         output_file=args.output,
         include_data=args.include_data,
-        compress=args.compress
+        compress=args.compress,
+        compress_algo=args.compress_algo,
+        gzip_level=args.gzip_level,
+        jobs=args.jobs,
+        backup_format=args.backup_format,
+        auto_compress=args.auto_compress
     )
     
     if success:
@@ -89,30 +96,45 @@ def backup_db_command(args):
         return 1
 
 
+@lru_cache(maxsize=1)
+def _alembic_config():
+    """Configuración de Alembic (se carga una sola vez por ejecución del CLI)"""
+    from alembic.config import Config
+    
+    return Config(str(root_dir / "alembic.ini"))
+
+
 def migrate_command(args):
-    """Comando para ejecutar migraciones"""
-    import subprocess
+    """Comando para ejecutar migraciones (API de Alembic en el mismo proceso)"""
+    from alembic import command
+    from alembic.util import CommandError
+    
+    cfg = _alembic_config()
     
     if args.action == "upgrade":
-        cmd = ["alembic", "upgrade", args.revision or "head"]
+        label, run = f"upgrade {args.revision or 'head'}", lambda: command.upgrade(cfg, args.revision or "head")
     elif args.action == "downgrade":
-        cmd = ["alembic", "downgrade", args.revision or "-1"]
+        label, run = f"downgrade {args.revision or '-1'}", lambda: command.downgrade(cfg, args.revision or "-1")
     elif args.action == "current":
-        cmd = ["alembic", "current"]
+        label, run = "current", lambda: command.current(cfg)
     elif args.action == "history":
-        cmd = ["alembic", "history"]
+        label, run = "history", lambda: command.history(cfg)
     elif args.action == "revision":
         if not args.message:
             print("❌ Se requiere un mensaje para crear una revisión")
             return 1
-        cmd = ["alembic", "revision", "--autogenerate", "-m", args.message]
+        label, run = f"revision --autogenerate -m {args.message}", lambda: command.revision(cfg, message=args.message, autogenerate=True)
     else:
         print(f"❌ Acción no válida: {args.action}")
         return 1
     
-    print(f"🔄 Ejecutando: {' '.join(cmd)}")
-    result = subprocess.run(cmd)
-    return result.returncode
+    print(f"🔄 Ejecutando: alembic {label}")
+    try:
+        run()
+    except CommandError as e:
+        print(f"❌ Error de Alembic: {e}")
+        return 1
+    return 0
 
 
 def status_command(args):
@@ -163,7 +185,7 @@ def main():
     seed_parser.add_argument(
         "--extended-org",
         action="store_true", 
-        help="Incluir estructura organizacional extendida"
+        help="Incluir estructura organizacional extendida (no disponible aún)"
     )
     seed_parser.add_argument(
         "--scenario",
@@ -171,6 +193,11 @@ def main():
         default="basico",
         help="Escenario de datos a cargar"
     )
+    seed_parser.add_argument(
+        "--dev-hash",
+        action="store_true",
+        help="Hash de contraseñas de costo mínimo (solo desarrollo; también con SGD_ENV=dev)"
+    )
     seed_parser.set_defaults(func=seed_data_command)
     
     # === Comando: reset-db ===
@@ -188,6 +215,12 @@ def main():
         action="store_true",
         help="Reinicializar automáticamente después del reset"
     )
+    reset_parser.add_argument(
+        "--mode",
+        choices=["schemas", "drop-database"],
+        default="schemas",
+        help="schemas: DROP SCHEMA/TABLE; drop-database: DROP/CREATE DATABASE desde template0 (requiere permisos)"
+    )
     reset_parser.set_defaults(func=reset_db_command)
     
     # === Comando: backup ===
@@ -210,6 +243,37 @@ def main():
         action="store_true",
         help="Comprimir el respaldo"
     )
+    backup_parser.add_argument(
+        "--compress-algo",
+        choices=["zstd", "gzip", "none"],
+        help="Algoritmo de compresión explícito (por defecto con --compress: gzip)"
+    )
+    backup_parser.add_argument(
+        "--auto-compress",
+        action="store_true",
+        help="Comprimir con zstd eligiendo el nivel según el tamaño de la BD (-1 / -3 / -15 --long)"
+    )
+    backup_parser.add_argument(
+        "--gzip-level",
+        type=int,
+        default=6,
+        choices=range(1, 10),
+        metavar="1-9",
+        help="Nivel de compresión gzip: 1-5 rápido, 6 equilibrado (defecto), 7-9 máximo"
+    )
+    backup_parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Trabajos paralelos de pg_dump (>1 usa formato directorio -Fd)"
+    )
+    backup_parser.add_argument(
+        "--format",
+        dest="backup_format",
+        choices=["plain", "custom", "directory"],
+        default="plain",
+        help="Formato: SQL plano, custom (-Fc, .dump) o directorio (-Fd)"
+    )
     backup_parser.set_defaults(func=backup_db_command)
     
     # === Comando: migrate ===
@@ -5,8 +5,11 @@ Script para crear respaldos de la base de datos
 
 import sys
 import os
-import subprocess
 import gzip
+import shutil
+import subprocess
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urlparse
@@ -17,6 +20,18 @@ sys.path.append(str(root_dir))
 
 from app.core.config import settings
 
+# fcntl solo existe en POSIX (ampliar buffers de pipe en Linux)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# gzip multihilo opcional para el respaldo en Python (sin binarios pigz/gzip)
+try:
+    import mgzip
+except ImportError:
+    mgzip = None
+
 
 def parse_database_url(database_url):
     """Parsear la URL de la base de datos para obtener parámetros de conexión"""
@@ -35,13 +50,110 @@ def parse_database_url(database_url):
         return None
 
 
-def create_backup_filename(output_file=None, compress=False):
-    """Crear nombre del archivo de respaldo"""
+@lru_cache(maxsize=1)
+def _get_db_config():
+    """Parámetros de conexión de settings.DATABASE_URL (se parsean una sola vez por proceso)"""
+    return parse_database_url(settings.DATABASE_URL)
+
+
+# Extensión del respaldo por algoritmo de compresión
+COMPRESSION_EXTENSIONS = {"zstd": ".sql.zst", "gzip": ".sql.gz", "none": ".sql"}
+
+# Extensión del formato custom (-Fc) de pg_dump, comprimido internamente
+CUSTOM_EXTENSION = ".dump"
+
+# Tamaño de bloque al copiar la salida de pg_dump desde Python (menos llamadas de lectura/escritura)
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Buffer del kernel para los pipes entre procesos (Linux: F_SETPIPE_SZ; el defecto es 64 KiB)
+PIPE_SIZE = 1024 * 1024
+
+# Nivel zstd por defecto y niveles adaptativos por tamaño de BD (--auto-compress):
+# respaldos pequeños priorizan velocidad, los muy grandes (archivo) priorizan tamaño
+ZSTD_DEFAULT_ARGS = ("-3",)
+ZSTD_SIZE_TIERS = (
+    (1024 ** 3, ("-1",)),
+    (50 * 1024 ** 3, ("-3",)),
+)
+ZSTD_ARCHIVE_ARGS = ("-15", "--long=27")
+
+# Trabajos de pg_restore por defecto: 2 ya solapa carga de datos y creación de índices sin saturar el servidor
+DEFAULT_RESTORE_JOBS = 2
+
+# Nivel gzip por defecto: 1-5 rápido, 6 equilibrado, 7-9 apenas reduce tamaño a mucho más CPU
+DEFAULT_GZIP_LEVEL = 6
+
+
+def enlarge_pipe(pipe):
+    """Ampliar el buffer del kernel de un pipe a PIPE_SIZE (solo Linux; si no, no hace nada)"""
+    if fcntl is None or not hasattr(fcntl, "F_SETPIPE_SZ"):
+        return
+    try:
+        fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+    except OSError:
+        # Límite de /proc/sys/fs/pipe-max-size o permisos: se mantiene el tamaño por defecto
+        pass
+
+
+def gzip_binary():
+    """Binario gzip disponible: pigz (paralelo, salida compatible con gzip), gzip o None"""
+    if shutil.which("pigz"):
+        return "pigz"
+    if shutil.which("gzip"):
+        return "gzip"
+    return None
+
+
+def adaptive_zstd_args(size_bytes):
+    """Nivel zstd según el tamaño de la BD: <1 GB -1, <50 GB -3, mayor -15 --long=27"""
+    if size_bytes is None:
+        return ZSTD_DEFAULT_ARGS
+    for limit, args in ZSTD_SIZE_TIERS:
+        if size_bytes < limit:
+            return args
+    return ZSTD_ARCHIVE_ARGS
+
+
+def compressor_command(compress_algo, gzip_level=DEFAULT_GZIP_LEVEL, zstd_args=ZSTD_DEFAULT_ARGS):
+    """Compresor externo (lee SQL por stdin, escribe a stdout) para el algoritmo indicado"""
+    if compress_algo == "zstd":
+        return ["zstd", *zstd_args, "-T0", "-c"]
+    if gzip_binary() == "pigz":
+        return ["pigz", "-p", str(os.cpu_count() or 1), f"-{gzip_level}", "-c"]
+    return ["gzip", f"-{gzip_level}", "-c"]
+
+
+def open_gzip_writer(fileobj, gzip_level=DEFAULT_GZIP_LEVEL):
+    """Escritor gzip en Python: mgzip multihilo si está instalado, si no el gzip estándar"""
+    if mgzip is not None:
+        return mgzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=gzip_level, thread=os.cpu_count() or 1)
+    return gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=gzip_level)
+
+
+def resolve_compress_algo(compress=False, compress_algo=None, auto_compress=False):
+    """
+    Algoritmo efectivo: el indicado; gzip con solo --compress (mismo .sql.gz de siempre);
+    zstd con --auto-compress (si está instalado, si no gzip)
+    """
+    if compress_algo:
+        return compress_algo
+    if auto_compress:
+        return "zstd" if shutil.which("zstd") else "gzip"
+    return "gzip" if compress else "none"
+
+
+def create_backup_filename(output_file=None, compress_algo="none", backup_format="plain"):
+    """Crear nombre del archivo (o directorio, formato -Fd) de respaldo"""
     if output_file:
         return output_file
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    extension = ".sql.gz" if compress else ".sql"
+    if backup_format == "directory":
+        extension = ""
+    elif backup_format == "custom":
+        extension = CUSTOM_EXTENSION
+    else:
+        extension = COMPRESSION_EXTENSIONS[compress_algo]
     
     # Crear directorio de respaldos si no existe
     backup_dir = Path("backups")
@@ -50,33 +162,150 @@ def create_backup_filename(output_file=None, compress=False):
     return backup_dir / f"sgd_colca_backup_{timestamp}{extension}"
 
 
-def create_backup(output_file=None, include_data=True, compress=False):
+def run_dump(cmd, env, backup_file, compress_algo="none", gzip_level=DEFAULT_GZIP_LEVEL, zstd_args=ZSTD_DEFAULT_ARGS):
+    """
+    Ejecutar pg_dump escribiendo en backup_file, comprimiendo con un proceso externo
+    (pg_dump | zstd / pigz / gzip); todo el flujo es binario, sin decodificar el SQL
+    
+    El SQL sin comprimir nunca se escribe a disco: el uso máximo de disco es el tamaño
+    del respaldo comprimido, no SQL plano + comprimido.
+    
+    Returns:
+        tuple: (código de salida, stderr de pg_dump como texto)
+    """
+    # stderr a archivo temporal: con --verbose es extenso y un PIPE sin leer bloquearía pg_dump
+    with tempfile.TemporaryFile() as err, open(backup_file, 'wb') as out:
+        if compress_algo == "none":
+            # pg_dump escribe directamente en el descriptor del archivo, sin copias en Python
+            dump = subprocess.Popen(cmd, stdout=out, stderr=err, env=env)
+            returncode = dump.wait()
+        elif compress_algo == "gzip" and gzip_binary() is None:
+            # Sin binario pigz/gzip (p. ej. Windows): gzip de Python sobre bytes, en bloques de 4 MiB
+            dump = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, env=env, bufsize=COPY_CHUNK_SIZE)
+            enlarge_pipe(dump.stdout)
+            with open_gzip_writer(out, gzip_level) as gz:
+                shutil.copyfileobj(dump.stdout, gz, COPY_CHUNK_SIZE)
+            dump.stdout.close()
+            returncode = dump.wait()
+        else:
+            dump = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, env=env)
+            enlarge_pipe(dump.stdout)
+            compressor = subprocess.Popen(compressor_command(compress_algo, gzip_level, zstd_args), stdin=dump.stdout, stdout=out)
+            # El compresor es el único lector: si termina, pg_dump recibe SIGPIPE
+            dump.stdout.close()
+            compressor_code = compressor.wait()
+            returncode = dump.wait() or compressor_code
+        
+        err.seek(0)
+        return returncode, err.read().decode('utf-8', 'replace')
+
+
+def run_native_dump(cmd, env):
+    """Ejecutar pg_dump en formato custom/directorio (escribe él mismo en --file, sin pasar por Python)"""
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env)
+    return result.returncode, result.stderr.decode('utf-8', 'replace')
+
+
+def archive_directory(backup_dir, zstd_args=ZSTD_DEFAULT_ARGS):
+    """
+    Empaquetar el directorio del respaldo en <dir>.tar.zst (tar | zstd) y eliminar el directorio
+    
+    Se escribe en <dir>.tar.zst.part y solo cuando tar y zstd terminan con 0 se renombra
+    y se borra el directorio: un fallo deja el respaldo -Fd intacto. Usa solo opciones
+    comunes a GNU tar y bsdtar.
+    
+    Returns:
+        Path: archivo generado
+    """
+    backup_dir = Path(backup_dir)
+    archive = backup_dir.with_name(backup_dir.name + ".tar.zst")
+    partial = archive.with_name(archive.name + ".part")
+    
+    tar = subprocess.Popen(["tar", "-cf", "-", "-C", str(backup_dir.parent), backup_dir.name], stdout=subprocess.PIPE)
+    enlarge_pipe(tar.stdout)
+    zstd = subprocess.Popen(["zstd", *zstd_args, "-T0", "-q", "-f", "-o", str(partial)], stdin=tar.stdout)
+    tar.stdout.close()
+    
+    zstd_rc = zstd.wait()
+    tar_rc = tar.wait()
+    if zstd_rc != 0 or tar_rc != 0:
+        partial.unlink(missing_ok=True)
+        raise RuntimeError(f"No se pudo empaquetar el directorio {backup_dir}")
+    
+    os.replace(partial, archive)
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    return archive
+
+
+def database_size(db_config, env):
+    """Tamaño de la BD en bytes (pg_database_size vía psql), o None si no se pudo consultar"""
+    cmd = psql_command(db_config, "--tuples-only", "--no-align", "--command=SELECT pg_database_size(current_database())")
+    try:
+        result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        return int(result.stdout.strip()) if result.returncode == 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def backup_size(path):
+    """Tamaño en bytes de un respaldo (archivo o directorio -Fd)"""
+    path = Path(path)
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+    return path.stat().st_size
+
+
+def create_backup(output_file=None, include_data=True, compress=False, compress_algo=None, gzip_level=DEFAULT_GZIP_LEVEL, jobs=1,
+                  backup_format="plain", auto_compress=False):
     """
     Crear respaldo de la base de datos usando pg_dump
     
     Args:
         output_file (str): Archivo de salida (opcional)
         include_data (bool): Incluir datos en el respaldo
-        compress (bool): Comprimir el respaldo
+        compress (bool): Comprimir el respaldo con gzip (zstd solo con compress_algo="zstd")
+        compress_algo (str): Algoritmo explícito: "zstd", "gzip" o "none"
+        gzip_level (int): Nivel de compresión gzip (1-9)
+        jobs (int): Conexiones paralelas de pg_dump; con más de 1 se usa el formato directorio (-Fd)
+        backup_format (str): "plain" (SQL), "custom" (-Fc, comprimido con gzip por pg_dump; no admite
+            compress_algo "zstd"/"none" ni auto_compress) o "directory" (-Fd)
+        auto_compress (bool): Comprimir eligiendo el nivel zstd según el tamaño de la BD
     """
     print("💾 Iniciando respaldo de base de datos...")
     print("=" * 50)
     
     try:
         # Parsear configuración de BD
-        db_config = parse_database_url(settings.DATABASE_URL)
+        db_config = _get_db_config()
         if not db_config:
             return False
         
         # Crear nombre del archivo
-        backup_file = create_backup_filename(output_file, compress)
+        if backup_format == "plain" and jobs > 1:
+            # pg_dump solo paraleliza en formato directorio
+            backup_format = "directory"
+        if backup_format == "custom" and (compress_algo not in (None, "gzip") or auto_compress):
+            print("❌ El formato custom (-Fc) solo comprime internamente con gzip (-Z); "
+                  "use --compress-algo gzip o los formatos plain/directory para zstd o sin compresión")
+            return False
+        compress_algo = resolve_compress_algo(compress, compress_algo, auto_compress)
+        if backup_format == "custom":
+            # -Fc comprime internamente con gzip (-Z), sin un segundo proceso
+            compress_algo = "gzip"
+        compress = compress_algo != "none"
+        directory = backup_format == "directory"
+        backup_file = create_backup_filename(output_file, compress_algo, backup_format)
         
         print(f"📋 Configuración del respaldo:")
         print(f"  • Base de datos: {db_config['database']}")
         print(f"  • Host: {db_config['host']}:{db_config['port']}")
         print(f"  • Incluir datos: {'Sí' if include_data else 'No'}")
-        print(f"  • Comprimir: {'Sí' if compress else 'No'}")
+        print(f"  • Comprimir: {compress_algo if compress else 'No'}")
         print(f"  • Archivo: {backup_file}")
+        if directory:
+            print(f"  • Formato: directorio (-Fd), {jobs} trabajos en paralelo")
+        elif backup_format == "custom":
+            print(f"  • Formato: custom (-Fc), compresión interna nivel {gzip_level}")
         print()
         
         # Preparar comando pg_dump
@@ -94,6 +323,12 @@ def create_backup(output_file=None, include_data=True, compress=False):
         if not include_data:
             cmd.append("--schema-only")
         
+        if directory:
+            # gzip: compresión por archivo de pg_dump; zstd: sin compresión interna, se empaqueta con tar | zstd
+            cmd += ["-Fd", f"--jobs={jobs}", f"--file={backup_file}", f"-Z{gzip_level if compress_algo == 'gzip' else 0}"]
+        elif backup_format == "custom":
+            cmd += ["-Fc", f"-Z{gzip_level}", f"--file={backup_file}"]
+        
         cmd.append(db_config['database'])
         
         # Configurar variable de entorno para la contraseña
@@ -101,33 +336,28 @@ def create_backup(output_file=None, include_data=True, compress=False):
         if db_config['password']:
             env['PGPASSWORD'] = db_config['password']
         
+        zstd_args = ZSTD_DEFAULT_ARGS
+        if auto_compress and compress_algo == "zstd":
+            size = database_size(db_config, env)
+            zstd_args = adaptive_zstd_args(size)
+            size_text = f"{size / (1024 * 1024):.0f} MB" if size is not None else "desconocido"
+            print(f"📐 Tamaño de la BD: {size_text} → zstd {' '.join(zstd_args)}")
+        
         print("🔄 Ejecutando pg_dump...")
         
-        # Ejecutar pg_dump
-        if compress:
-            # Comprimir directamente
-            with gzip.open(backup_file, 'wt', encoding='utf-8') as f:
-                result = subprocess.run(
-                    cmd,
-                    stdout=f,
-                    stderr=subprocess.PIPE,
-                    env=env,
-                    text=True
-                )
+        # Ejecutar pg_dump (comprimiendo en el mismo pipeline)
+        if directory:
+            returncode, stderr = run_native_dump(cmd, env)
+            if returncode == 0 and compress_algo == "zstd":
+                backup_file = archive_directory(backup_file, zstd_args)
+        elif backup_format == "custom":
+            returncode, stderr = run_native_dump(cmd, env)
         else:
-            # Sin compresión
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                result = subprocess.run(
-                    cmd,
-                    stdout=f,
-                    stderr=subprocess.PIPE,
-                    env=env,
-                    text=True
-                )
+            returncode, stderr = run_dump(cmd, env, backup_file, compress_algo, gzip_level, zstd_args)
         
         # Verificar resultado
-        if result.returncode == 0:
-            file_size = Path(backup_file).stat().st_size
+        if returncode == 0:
+            file_size = backup_size(backup_file)
             size_mb = file_size / (1024 * 1024)
             
             print("=" * 50)
@@ -139,11 +369,18 @@ def create_backup(output_file=None, include_data=True, compress=False):
             print(f"\n📋 Detalles del respaldo:")
             print(f"  • Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"  • Tipo: {'Solo estructura' if not include_data else 'Estructura + datos'}")
-            print(f"  • Formato: {'Comprimido (gzip)' if compress else 'SQL plano'}")
+            if backup_format == "plain":
+                print(f"  • Formato: {f'Comprimido ({compress_algo})' if compress else 'SQL plano'}")
+            else:
+                print(f"  • Formato: {backup_format} (pg_restore)")
             
             # Instrucciones para restaurar
             print(f"\n🔄 Para restaurar este respaldo:")
-            if compress:
+            if backup_format != "plain":
+                print(f"   python scripts/database/backup_db.py restore {backup_file}")
+            elif compress_algo == "zstd":
+                print(f"   zstd -dc {backup_file} | psql -h {db_config['host']} -U {db_config['username']} -d {db_config['database']}")
+            elif compress:
                 print(f"   gunzip -c {backup_file} | psql -h {db_config['host']} -U {db_config['username']} -d {db_config['database']}")
             else:
                 print(f"   psql -h {db_config['host']} -U {db_config['username']} -d {db_config['database']} -f {backup_file}")
@@ -151,11 +388,11 @@ def create_backup(output_file=None, include_data=True, compress=False):
             return True
         else:
             print("❌ Error durante el respaldo:")
-            print(result.stderr)
+            print(stderr)
             return False
         
-    except FileNotFoundError:
-        print("❌ Error: pg_dump no encontrado")
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e.filename or 'pg_dump'} no encontrado")
         print("💡 Instala PostgreSQL client tools:")
         print("   - Ubuntu/Debian: sudo apt-get install postgresql-client")
         print("   - CentOS/RHEL: sudo yum install postgresql")
@@ -168,13 +405,71 @@ def create_backup(output_file=None, include_data=True, compress=False):
         return False
 
 
-def restore_backup(backup_file, drop_existing=False):
+def extract_archive(archive, target_dir):
+    """Desempaquetar un respaldo .tar.zst (zstd -dc | tar -x) y retornar el directorio -Fd"""
+    zstd = subprocess.Popen(["zstd", "-dc", str(archive)], stdout=subprocess.PIPE)
+    enlarge_pipe(zstd.stdout)
+    tar = subprocess.Popen(["tar", "-xf", "-", "-C", str(target_dir)], stdin=zstd.stdout)
+    zstd.stdout.close()
+    
+    if tar.wait() != 0 or zstd.wait() != 0:
+        raise RuntimeError(f"No se pudo desempaquetar {archive}")
+    
+    return Path(target_dir) / Path(archive).name[:-len(".tar.zst")]
+
+
+def run_pg_restore(source, db_config, env, jobs=1):
+    """Restaurar un respaldo de formato archivo/directorio con pg_restore en paralelo"""
+    cmd = [
+        "pg_restore",
+        f"--host={db_config['host']}",
+        f"--port={db_config['port']}",
+        f"--username={db_config['username']}",
+        f"--dbname={db_config['database']}",
+        f"--jobs={jobs}",
+        "--clean",
+        "--if-exists",
+        str(source)
+    ]
+    return subprocess.run(cmd, env=env)
+
+
+def psql_command(db_config, *extra):
+    """Comando psql contra la base de datos configurada"""
+    return [
+        "psql",
+        f"--host={db_config['host']}",
+        f"--port={db_config['port']}",
+        f"--username={db_config['username']}",
+        f"--dbname={db_config['database']}",
+        *extra
+    ]
+
+
+def run_psql_pipeline(decompress_cmd, db_config, env):
+    """
+    Restaurar un SQL comprimido con descompresor | psql conectados por sus descriptores
+    (sin /bin/sh intermedio ni cadenas de shell que escapar)
+    """
+    decompress = subprocess.Popen(decompress_cmd, stdout=subprocess.PIPE, env=env)
+    enlarge_pipe(decompress.stdout)
+    psql = subprocess.Popen(psql_command(db_config), stdin=decompress.stdout, env=env)
+    # psql es el único lector: si termina, el descompresor recibe SIGPIPE
+    decompress.stdout.close()
+    
+    psql_code = psql.wait()
+    returncode = decompress.wait() or psql_code
+    return subprocess.CompletedProcess(decompress_cmd, returncode)
+
+
+def restore_backup(backup_file, drop_existing=False, jobs=DEFAULT_RESTORE_JOBS):
     """
     Restaurar base de datos desde un respaldo
     
     Args:
-        backup_file (str): Archivo de respaldo
+        backup_file (str): Archivo de respaldo (o directorio -Fd)
         drop_existing (bool): Eliminar BD existente antes de restaurar
+        jobs (int): Trabajos paralelos de pg_restore (respaldos en formato custom/directorio)
     """
     print(f"🔄 Restaurando respaldo desde: {backup_file}")
     print("=" * 50)
@@ -186,7 +481,7 @@ def restore_backup(backup_file, drop_existing=False):
             return False
         
         # Parsear configuración de BD
-        db_config = parse_database_url(settings.DATABASE_URL)
+        db_config = _get_db_config()
         if not db_config:
             return False
         
@@ -195,6 +490,7 @@ def restore_backup(backup_file, drop_existing=False):
         print(f"  • Host: {db_config['host']}:{db_config['port']}")
         print(f"  • Archivo: {backup_file}")
         print(f"  • Eliminar existente: {'Sí' if drop_existing else 'No'}")
+        print(f"  • Trabajos pg_restore: {jobs}")
         print()
         
         # Configurar variable de entorno para la contraseña
@@ -203,21 +499,25 @@ def restore_backup(backup_file, drop_existing=False):
             env['PGPASSWORD'] = db_config['password']
         
         # Comando de restauración
-        if backup_file.endswith('.gz'):
+        if Path(backup_file).is_dir():
+            # Formato directorio (-Fd)
+            result = run_pg_restore(backup_file, db_config, env, jobs)
+        elif backup_file.endswith(CUSTOM_EXTENSION):
+            # Formato custom (-Fc)
+            result = run_pg_restore(backup_file, db_config, env, jobs)
+        elif backup_file.endswith('.tar.zst'):
+            # Formato directorio empaquetado con tar | zstd
+            with tempfile.TemporaryDirectory() as tmp:
+                result = run_pg_restore(extract_archive(backup_file, tmp), db_config, env, jobs)
+        elif backup_file.endswith('.zst'):
+            # Archivo comprimido con zstd
+            result = run_psql_pipeline(["zstd", "-dc", backup_file], db_config, env)
+        elif backup_file.endswith('.gz'):
             # Archivo comprimido
-            cmd = f"gunzip -c {backup_file} | psql -h {db_config['host']} -p {db_config['port']} -U {db_config['username']} -d {db_config['database']}"
-            result = subprocess.run(cmd, shell=True, env=env)
+            result = run_psql_pipeline(["gunzip", "-c", backup_file], db_config, env)
         else:
             # Archivo sin comprimir
-            cmd = [
-                "psql",
-                f"--host={db_config['host']}",
-                f"--port={db_config['port']}",
-                f"--username={db_config['username']}",
-                f"--dbname={db_config['database']}",
-                f"--file={backup_file}"
-            ]
-            result = subprocess.run(cmd, env=env)
+            result = subprocess.run(psql_command(db_config, f"--file={backup_file}"), env=env)
         
         if result.returncode == 0:
             print("✅ Respaldo restaurado exitosamente!")
@@ -241,12 +541,23 @@ if __name__ == "__main__":
     backup_parser = subparsers.add_parser("create", help="Crear respaldo")
     backup_parser.add_argument("--output", "-o", help="Archivo de salida")
     backup_parser.add_argument("--no-data", action="store_true", help="Solo estructura (sin datos)")
-    backup_parser.add_argument("--compress", action="store_true", help="Comprimir respaldo")
+    backup_parser.add_argument("--compress", action="store_true", help="Comprimir respaldo con gzip (zstd con --compress-algo zstd)")
+    backup_parser.add_argument("--auto-compress", action="store_true",
+                               help="Comprimir con zstd eligiendo el nivel según el tamaño de la BD (-1 / -3 / -15 --long)")
+    backup_parser.add_argument("--compress-algo", choices=["zstd", "gzip", "none"], help="Algoritmo de compresión explícito")
+    backup_parser.add_argument("--jobs", "-j", type=int, default=1,
+                               help="Trabajos paralelos de pg_dump (>1 usa formato directorio -Fd)")
+    backup_parser.add_argument("--format", dest="backup_format", choices=["plain", "custom", "directory"], default="plain",
+                               help="Formato: SQL plano, custom (-Fc, .dump) o directorio (-Fd)")
+    backup_parser.add_argument("--gzip-level", type=int, default=DEFAULT_GZIP_LEVEL, choices=range(1, 10), metavar="1-9",
+                               help="Nivel gzip: 1-5 rápido, 6 equilibrado (defecto), 7-9 máximo")
     
     # Comando para restaurar respaldo
     restore_parser = subparsers.add_parser("restore", help="Restaurar respaldo")
     restore_parser.add_argument("file", help="Archivo de respaldo")
     restore_parser.add_argument("--drop", action="store_true", help="Eliminar BD existente")
+    restore_parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_RESTORE_JOBS,
+                                help="Trabajos paralelos de pg_restore (respaldos .dump o directorio)")
     
     args = parser.parse_args()
     
@@ -254,12 +565,18 @@ if __name__ == "__main__":
         success = create_backup(
             output_file=args.output,
             include_data=not args.no_data,
-            compress=args.compress
+            compress=args.compress,
+            compress_algo=args.compress_algo,
+            gzip_level=args.gzip_level,
+            jobs=args.jobs,
+            backup_format=args.backup_format,
+            auto_compress=args.auto_compress
         )
     elif args.action == "restore":
         success = restore_backup(
             backup_file=args.file,
-            drop_existing=args.drop
+            drop_existing=args.drop,
+            jobs=args.jobs
         )
     else:
         parser.print_help()
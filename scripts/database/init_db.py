@@ -5,6 +5,7 @@ Aplica migraciones (sin insertar datos iniciales)
 
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # Agregar el directorio raíz al path
@@ -14,11 +15,30 @@ sys.path.append(str(root_dir))
 from alembic import command
 from alembic.config import Config
 
-def apply_migrations():
-    """Aplicar todas las migraciones de Alembic"""
+from app.core.sync_database import engine
+
+
+@lru_cache(maxsize=1)
+def _alembic_config():
+    """Configuración de Alembic (se carga una sola vez por proceso)"""
+    config = Config(str(root_dir / "alembic.ini"))
+    # script_location es relativo al directorio actual: fijarlo a la raíz del proyecto
+    config.set_main_option("script_location", str(root_dir / "alembic"))
+    return config
+
+
+def apply_migrations(connection=None):
+    """
+    Aplicar todas las migraciones de Alembic
+    
+    Args:
+        connection: Conexión a reutilizar (env.py la toma de config.attributes);
+            sin ella Alembic abre su propio engine
+    """
     try:
         print("📊 Aplicando migraciones de base de datos...")
-        alembic_cfg = Config("alembic.ini")
+        alembic_cfg = _alembic_config()
+        alembic_cfg.attributes['connection'] = connection
         command.upgrade(alembic_cfg, "head")
         print("✅ Migraciones aplicadas exitosamente")
         return True
@@ -26,15 +46,24 @@ def apply_migrations():
         print(f"❌ Error aplicando migraciones: {e}")
         return False
 
-def init_database():
+def init_database(connection=None):
     """
     Inicializar base de datos (solo migraciones)
+    
+    Args:
+        connection: Conexión abierta a reutilizar; por defecto una del engine síncrono
+            compartido (el mismo pool que usan reset-db y seed-data)
     """
     print("🚀 Iniciando inicialización de base de datos...")
     print("=" * 50)
     
     try:
-        if not apply_migrations():
+        if connection is None:
+            with engine.connect() as connection:
+                if not apply_migrations(connection):
+                    return False
+                connection.commit()
+        elif not apply_migrations(connection):
             return False
         
         print("=" * 50)
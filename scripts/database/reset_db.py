@@ -12,66 +12,83 @@ from pathlib import Path
 root_dir = Path(__file__).parent.parent.parent
 sys.path.append(str(root_dir))
 
-from sqlalchemy import text, MetaData
-from alembic import command
-from alembic.config import Config
+from sqlalchemy import create_engine, text
 
-from app.core.database import engine, SessionLocal
+from app.core.sync_database import engine, SessionLocal
+
+
+# Esquemas propios de la aplicación
+SCHEMAS = ['seguridad', 'organizacion']
 
 
 def drop_all_tables():
-    """Eliminar todas las tablas de la base de datos"""
-    print("🗑️ Eliminando todas las tablas...")
+    """
+    Eliminar esquemas propios y tablas del esquema público (incluida alembic_version)
+    
+    DROP SCHEMA ... CASCADE ya elimina todas las tablas de cada esquema, por lo que no
+    se reflejan metadatos: una consulta a pg_tables para el esquema público y todos los
+    DROP en una sola transacción.
+    """
+    print("🗑️ Eliminando esquemas y tablas...")
     
     try:
-        with engine.connect() as connection:
-            # Obtener metadatos de todas las tablas
-            metadata = MetaData()
-            metadata.reflect(bind=engine, schema='seguridad')
-            metadata.reflect(bind=engine, schema='organizacion')
-            metadata.reflect(bind=engine)  # Schema público
-            
-            # Eliminar todas las tablas en orden reverso (por las FK)
-            metadata.drop_all(bind=engine)
-            
-            # También eliminar la tabla de versiones de Alembic
-            try:
-                connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
-                connection.commit()
-            except:
-                pass
-            
-            print("✅ Todas las tablas eliminadas")
-            return True
+        with engine.begin() as connection:
+            public_tables = connection.execute(
+                text("SELECT quote_ident(tablename) FROM pg_tables WHERE schemaname = 'public'")
+            ).scalars().all()
             
+            stmts = [f"DROP SCHEMA IF EXISTS {', '.join(SCHEMAS)} CASCADE"]
+            if public_tables:
+                stmts.append(f"DROP TABLE IF EXISTS {', '.join(public_tables)} CASCADE")
+            connection.execute(text(";".join(stmts)))
+        
+        print("\n".join(f"  ➖ Esquema eliminado: {schema}" for schema in SCHEMAS))
+        print(f"  ➖ Tablas del esquema público eliminadas: {len(public_tables)}")
+        print("✅ Esquemas y tablas eliminados")
+        return True
+        
     except Exception as e:
         print(f"❌ Error eliminando tablas: {e}")
         return False
 
 
-def drop_schemas():
-    """Eliminar esquemas personalizados"""
-    print("📁 Eliminando esquemas...")
+def drop_and_recreate_database():
+    """
+    Eliminar y recrear la base de datos completa desde template0
+    
+    Se ejecuta contra la base de mantenimiento "postgres" (DROP/CREATE DATABASE no admiten
+    transacción). El tiempo no depende del número de tablas ni de filas. Requiere
+    PostgreSQL 13+ (WITH (FORCE)) y permisos para crear bases de datos.
+    """
+    print("🗑️ Eliminando y recreando la base de datos...")
+    
+    database = engine.url.database
+    owner = engine.url.username
+    
+    # Las conexiones del pool apuntan a la base que se va a eliminar
+    engine.dispose()
+    
+    maintenance = create_engine(engine.url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    quote = maintenance.dialect.identifier_preparer.quote
     
     try:
-        with engine.connect() as connection:
-            # Eliminar esquemas en orden (primero las tablas, luego los esquemas)
-            schemas_to_drop = ['seguridad', 'organizacion']
-            
-            for schema in schemas_to_drop:
-                try:
-                    connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
-                    print(f"  ➖ Esquema eliminado: {schema}")
-                except Exception as e:
-                    print(f"  ⚠️ Error eliminando esquema {schema}: {e}")
-            
-            connection.commit()
-            print("✅ Esquemas eliminados")
-            return True
+        with maintenance.connect() as connection:
+            connection.execute(text(f"DROP DATABASE IF EXISTS {quote(database)} WITH (FORCE)"))
+            print(f"  ➖ Base de datos eliminada: {database}")
             
+            owner_clause = f" OWNER {quote(owner)}" if owner else ""
+            connection.execute(text(f"CREATE DATABASE {quote(database)}{owner_clause} TEMPLATE template0"))
+            print(f"  ➕ Base de datos creada: {database}")
+        
+        print("✅ Base de datos recreada")
+        return True
+        
     except Exception as e:
-        print(f"❌ Error eliminando esquemas: {e}")
+        print(f"❌ Error recreando base de datos: {e}")
         return False
+    
+    finally:
+        maintenance.dispose()
 
 
 def recreate_schemas():
@@ -80,9 +97,7 @@ def recreate_schemas():
     
     try:
         with engine.connect() as connection:
-            schemas_to_create = ['seguridad', 'organizacion']
-            
-            for schema in schemas_to_create:
+            for schema in SCHEMAS:
                 connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
                 print(f"  ➕ Esquema creado: {schema}")
             
@@ -95,24 +110,6 @@ def recreate_schemas():
         return False
 
 
-def reset_alembic():
-    """Resetear el historial de Alembic"""
-    print("📊 Reseteando historial de Alembic...")
-    
-    try:
-        with engine.connect() as connection:
-            # Eliminar tabla de versiones de Alembic
-            connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
-            connection.commit()
-            
-        print("✅ Historial de Alembic reseteado")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error reseteando Alembic: {e}")
-        return False
-
-
 def reinitialize_database():
     """Reinicializar la base de datos después del reset"""
     print("🔄 Reinicializando base de datos...")
@@ -121,7 +118,7 @@ def reinitialize_database():
         from scripts.database.init_db import init_database
         
         # Inicializar con migraciones
-        success = init_database(skip_migrations=False)
+        success = init_database()
         
         if success:
             print("✅ Base de datos reinicializada")
@@ -135,13 +132,15 @@ def reinitialize_database():
         return False
 
 
-def reset_database(reinit=False, force=False):
+def reset_database(reinit=False, force=False, mode="schemas"):
     """
     Resetear completamente la base de datos
     
     Args:
         reinit (bool): Si True, reinicializa automáticamente después del reset
         force (bool): Si True, no pide confirmación
+        mode (str): "schemas" (DROP SCHEMA/TABLE) o "drop-database" (DROP/CREATE DATABASE,
+            requiere permisos de creación de bases de datos)
     """
     print("🚨 RESETEO COMPLETO DE BASE DE DATOS")
     print("=" * 50)
@@ -159,30 +158,21 @@ def reset_database(reinit=False, force=False):
         print()
     
     try:
-        # 1. Eliminar todas las tablas
-        if not drop_all_tables():
-            return False
-        print()
-        
-        # 2. Eliminar esquemas
-        if not drop_schemas():
+        # 1. Eliminar esquemas y tablas (incluye el historial de Alembic)
+        drop = drop_and_recreate_database if mode == "drop-database" else drop_all_tables
+        if not drop():
             return False
         print()
         
-        # 3. Recrear esquemas básicos
+        # 2. Recrear esquemas básicos
         if not recreate_schemas():
             return False
         print()
         
-        # 4. Resetear Alembic
-        if not reset_alembic():
-            return False
-        print()
-        
         print("=" * 50)
         print("🗑️ Base de datos reseteada completamente")
         
-        # 5. Reinicializar si se solicita
+        # 3. Reinicializar si se solicita
         if reinit:
             print()
             if not reinitialize_database():
@@ -215,6 +205,7 @@ Use solo en desarrollo o con respaldo completo.
 Ejemplos:
   python reset_db.py                    # Reset con confirmación
   python reset_db.py --force --reinit   # Reset y reinit automático
+  python reset_db.py --mode drop-database --reinit   # Recrear la BD completa
         """
     )
     
@@ -228,12 +219,19 @@ Ejemplos:
         action="store_true",
         help="Reinicializar automáticamente después del reset"
     )
+    parser.add_argument(
+        "--mode",
+        choices=["schemas", "drop-database"],
+        default="schemas",
+        help="schemas: DROP SCHEMA/TABLE; drop-database: DROP/CREATE DATABASE desde template0 (requiere permisos)"
+    )
     
     args = parser.parse_args()
     
     success = reset_database(
         reinit=args.reinit,
-        force=args.force
+        force=args.force,
+        mode=args.mode
     )
     
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -5,181 +5,149 @@ Script para poblar la base de datos con datos de prueba
 
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # Agregar el directorio raíz al path
 root_dir = Path(__file__).parent.parent.parent
 sys.path.append(str(root_dir))
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from app.core.security import generate_password_hash
+from app.core.security import hash_password, pwd_context
 
-from app.core.database import SessionLocal
-from app.models import Usuario, UnidadOrganica, Puesto
-from app.data import (
+from app.core.sync_database import SessionLocal
+from app.models.seguridad.usuario_model import Usuario
+from app.data.test_data import (
     USUARIOS_TEST,
-    UNIDADES_TEST,
-    PUESTOS_TEST,
     ESCENARIOS_TEST
 )
 
+# Usernames del escenario básico (pertenencia O(1) al filtrar USUARIOS_TEST)
+BASIC_USERNAMES = frozenset(ESCENARIOS_TEST["usuarios_basicos"]["usuarios"])
 
-def create_test_users(db: Session, scenario="basico"):
+
+def usuarios_del_escenario(scenario):
+    """Usuarios de prueba a crear según el escenario"""
+    if scenario == "basico":
+        return [u for u in USUARIOS_TEST if u["username"] in BASIC_USERNAMES]
+    return USUARIOS_TEST
+
+
+def dev_hash_enabled(dev_hash=False):
+    """Hash rápido solo para desarrollo: --dev-hash o SGD_ENV=dev"""
+    return dev_hash or os.environ.get("SGD_ENV") == "dev"
+
+
+def password_hasher(dev_hash=False):
+    """
+    Función de hash para las contraseñas de prueba
+    
+    En desarrollo usa Argon2id con costo mínimo (~2 ms por hash en lugar de ~50 ms); al ser
+    parámetros distintos a los configurados, needs_rehash los actualiza en el primer login.
+    
+    Memoizada por contraseña: los usuarios de prueba comparten contraseña (y por tanto hash,
+    aceptable solo en datos de prueba), así se calcula un hash por contraseña distinta.
+    """
+    if dev_hash_enabled(dev_hash):
+        hasher = pwd_context.copy(argon2__time_cost=1, argon2__memory_cost=1024, argon2__parallelism=1).hash
+    else:
+        hasher = hash_password
+    return lru_cache(maxsize=None)(hasher)
+
+
+def usuario_row(user_data, hasher):
+    """
+    Fila de seguridad.usuario a partir de un usuario de USUARIOS_TEST
+    
+    username y puesto_codigo solo identifican al usuario en los escenarios de prueba
+    (no son columnas); "apellidos" se separa en paterno / materno.
+    """
+    apellido_paterno, _, apellido_materno = user_data["apellidos"].partition(" ")
+    return {
+        "email": user_data["email"],
+        "nombres": user_data["nombres"],
+        "apellido_paterno": apellido_paterno,
+        "apellido_materno": apellido_materno,
+        "dni": user_data.get("dni"),
+        "telefono": user_data.get("telefono"),
+        "tipo": user_data["tipo_usuario"],
+        "estado": user_data.get("estado", "ACTIVO"),
+        "password_hash": hasher(user_data["password"]),
+    }
+
+
+def create_test_users(db: Session, scenario="basico", dev_hash=False):
     """Crear usuarios de prueba"""
     print("👥 Creando usuarios de prueba...")
     
     try:
         # Determinar qué usuarios crear según el escenario
-        if scenario == "basico":
-            usuarios_a_crear = [u for u in USUARIOS_TEST if u["username"] in ESCENARIOS_TEST["usuarios_basicos"]["usuarios"]]
-        else:
-            usuarios_a_crear = USUARIOS_TEST
+        usuarios_a_crear = usuarios_del_escenario(scenario)
         
-        created_count = 0
+        # Usuarios existentes (por email, único) en una sola consulta
+        emails = [u["email"] for u in usuarios_a_crear]
+        existentes = set(db.scalars(
+            select(Usuario.email).where(Usuario.email.in_(emails))
+        ))
         
-        for user_data in usuarios_a_crear:
-            # Verificar si el usuario ya existe
-            existing = db.query(Usuario).filter(
-                Usuario.username == user_data["username"]
-            ).first()
-            
-            if not existing:
-                user_info = user_data.copy()
-                
-                # Hash de la contraseña
-                password = user_info.pop("password")
-                user_info["password_hash"] = generate_password_hash(password)
-                
-                # Resolver puesto si existe
-                puesto_codigo = user_info.pop("puesto_codigo", None)
-                if puesto_codigo:
-                    puesto = db.query(Puesto).filter(
-                        Puesto.codigo == puesto_codigo
-                    ).first()
-                    if puesto:
-                        user_info["puesto_id"] = puesto.id
-                
-                usuario = Usuario(**user_info)
-                db.add(usuario)
-                created_count += 1
-                print(f"  ➕ Usuario creado: {user_data['username']} ({user_data['tipo_usuario']})")
-            else:
-                print(f"  ⏭️ Usuario ya existe: {user_data['username']}")
-        
-        db.commit()
-        print(f"✅ {created_count} usuarios de prueba creados")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error creando usuarios de prueba: {e}")
-        db.rollback()
-        return False
-
-
-def create_extended_organization(db: Session):
-    """Crear estructura organizacional extendida"""
-    print("🏢 Creando estructura organizacional extendida...")
-    
-    try:
-        # Crear unidades adicionales
-        for unidad_data in UNIDADES_TEST:
-            existing = db.query(UnidadOrganica).filter(
-                UnidadOrganica.sigla == unidad_data["sigla"]
-            ).first()
-            
-            if not existing:
-                unidad_info = unidad_data.copy()
-                
-                # Resolver unidad padre
-                if "unidad_padre_sigla" in unidad_info:
-                    padre_sigla = unidad_info.pop("unidad_padre_sigla")
-                    padre = db.query(UnidadOrganica).filter(
-                        UnidadOrganica.sigla == padre_sigla
-                    ).first()
-                    if padre:
-                        unidad_info["unidad_padre_id"] = padre.id
-                
-                unidad = UnidadOrganica(**unidad_info)
-                db.add(unidad)
-                print(f"  ➕ Unidad creada: {unidad_data['sigla']} - {unidad_data['nombre']}")
-            else:
-                print(f"  ⏭️ Unidad ya existe: {unidad_data['sigla']}")
+        hasher = password_hasher(dev_hash)
+        rows = [
+            usuario_row(user_data, hasher)
+            for user_data in usuarios_a_crear
+            if user_data["email"] not in existentes
+        ]
         
-        # Crear puestos adicionales
-        for puesto_data in PUESTOS_TEST:
-            existing = db.query(Puesto).filter(
-                Puesto.codigo == puesto_data["codigo"]
-            ).first()
-            
-            if not existing:
-                puesto_info = puesto_data.copy()
-                
-                # Resolver unidad orgánica
-                unidad_sigla = puesto_info.pop("unidad_organica_sigla")
-                unidad = db.query(UnidadOrganica).filter(
-                    UnidadOrganica.sigla == unidad_sigla
-                ).first()
-                if unidad:
-                    puesto_info["unidad_organica_id"] = unidad.id
-                
-                # Resolver puesto superior
-                if "puesto_superior_codigo" in puesto_info:
-                    superior_codigo = puesto_info.pop("puesto_superior_codigo")
-                    superior = db.query(Puesto).filter(
-                        Puesto.codigo == superior_codigo
-                    ).first()
-                    if superior:
-                        puesto_info["puesto_superior_id"] = superior.id
-                
-                puesto = Puesto(**puesto_info)
-                db.add(puesto)
-                print(f"  ➕ Puesto creado: {puesto_data['codigo']} - {puesto_data['nombre']}")
-            else:
-                print(f"  ⏭️ Puesto ya existe: {puesto_data['codigo']}")
+        # Inserción masiva (executemany agrupado del engine síncrono)
+        if rows:
+            db.execute(insert(Usuario), rows)
         
-        db.commit()
-        print("✅ Estructura organizacional extendida creada")
+        # Un solo resumen en lugar de una línea por fila
+        print(f"  ➕ {len(rows)} creados, {len(usuarios_a_crear) - len(rows)} existentes")
+        print(f"✅ {len(rows)} usuarios de prueba creados")
         return True
         
     except Exception as e:
-        print(f"❌ Error creando estructura extendida: {e}")
+        print(f"❌ Error creando usuarios de prueba: {e}")
         db.rollback()
         return False
 
 
-def seed_test_data(include_users=True, include_extended_org=False, scenario="basico"):
+def seed_test_data(include_users=True, include_extended_org=False, scenario="basico", dev_hash=False):
     """
     Poblar base de datos con datos de prueba
     
     Args:
         include_users (bool): Incluir usuarios de prueba
-        include_extended_org (bool): Incluir estructura organizacional extendida
+        include_extended_org (bool): Estructura organizacional extendida (no disponible:
+            los modelos UnidadOrganica/Puesto aún no existen)
         scenario (str): Escenario de datos (basico, completo, desarrollo)
+        dev_hash (bool): Hash de contraseñas de costo mínimo (solo desarrollo)
     """
+    if include_extended_org:
+        print("❌ La estructura organizacional extendida no está disponible: "
+              "los modelos UnidadOrganica y Puesto aún no existen en app/models")
+        return False
+    
     print("🌱 Iniciando población de datos de prueba...")
     print("=" * 50)
     print(f"📋 Configuración:")
     print(f"  • Escenario: {scenario}")
     print(f"  • Incluir usuarios: {'Sí' if include_users else 'No'}")
-    print(f"  • Estructura extendida: {'Sí' if include_extended_org else 'No'}")
+    print(f"  • Hash rápido (dev): {'Sí' if dev_hash_enabled(dev_hash) else 'No'}")
     print()
     
     try:
-        db = SessionLocal()
-        
-        # 1. Crear estructura organizacional extendida si se solicita
-        if include_extended_org:
-            if not create_extended_organization(db):
-                return False
-            print()
-        
-        # 2. Crear usuarios de prueba si se solicita
-        if include_users:
-            if not create_test_users(db, scenario):
-                return False
-            print()
-        
-        db.close()
+        # Toda la carga en una sola transacción (las funciones no hacen commit y revierten
+        # todo ante un error); SessionLocal ya usa autoflush=False
+        with SessionLocal() as db:
+            # Crear usuarios de prueba si se solicita
+            if include_users:
+                if not create_test_users(db, scenario, dev_hash):
+                    return False
+                print()
+            
+            db.commit()
         
         print("=" * 50)
         print("🎉 Datos de prueba cargados exitosamente!")
@@ -187,12 +155,11 @@ def seed_test_data(include_users=True, include_extended_org=False, scenario="bas
         
         if include_users:
             print("🔐 Usuarios de prueba creados:")
-            usuarios_scenario = USUARIOS_TEST
-            if scenario == "basico":
-                usuarios_scenario = [u for u in USUARIOS_TEST if u["username"] in ESCENARIOS_TEST["usuarios_basicos"]["usuarios"]]
-            
-            for user in usuarios_scenario:
-                print(f"  • {user['username']} ({user['tipo_usuario']}) - Email: {user['email']}")
+            # Un solo write para todo el listado
+            print("\n".join(
+                f"  • {user['username']} ({user['tipo_usuario']}) - Email: {user['email']}"
+                for user in usuarios_del_escenario(scenario)
+            ))
             print("  🔑 Contraseña para todos: test123")
         
         print("\n⚠️ Estos datos son SOLO para desarrollo/testing")
@@ -223,7 +190,12 @@ if __name__ == "__main__":
     parser.add_argument(
         "--extended-org",
         action="store_true",
-        help="Incluir estructura organizacional extendida"
+        help="Incluir estructura organizacional extendida (no disponible aún)"
+    )
+    parser.add_argument(
+        "--dev-hash",
+        action="store_true",
+        help="Hash de contraseñas de costo mínimo (solo desarrollo; también con SGD_ENV=dev)"
     )
     
     args = parser.parse_args()
@@ -231,7 +203,8 @@ if __name__ == "__main__":
     success = seed_test_data(
         include_users=not args.no_users,
         include_extended_org=args.extended_org,
-        scenario=args.scenario
+        scenario=args.scenario,
+        dev_hash=args.dev_hash
     )
     
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -5,6 +5,7 @@ Script para mostrar el estado del sistema y base de datos
 
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
@@ -12,23 +13,33 @@ from datetime import datetime
 root_dir = Path(__file__).parent.parent.parent
 sys.path.append(str(root_dir))
 
-from sqlalchemy import text, inspect
+from sqlalchemy import func, inspect, select, text
 from sqlalchemy.exc import OperationalError
 from alembic import command
 from alembic.config import Config
 from alembic.runtime.migration import MigrationContext
 from alembic.script import ScriptDirectory
 
-from app.core.database import engine, SessionLocal
-from app.models import Usuario, Permiso, UnidadOrganica, Puesto
+from app.core.sync_database import engine, SessionLocal
+from app.models.seguridad.usuario_model import Usuario
 from app.core.config import settings
 
+# Tablas principales cuyo número de registros se muestra (solo modelos mapeados)
+COUNTED_TABLES = {
+    'usuarios': Usuario,
+}
+
 
 def check_database_connection():
-    """Verificar conexión a la base de datos"""
+    """
+    Verificar conexión a la base de datos
+    
+    Basta con obtener una conexión del pool: las nuevas se validan al autenticarse y las
+    reutilizadas con pool_pre_ping, sin un SELECT 1 adicional.
+    """
     try:
-        with engine.connect() as connection:
-            connection.execute(text("SELECT 1"))
+        with engine.connect():
+            pass
         return True, "✅ Conexión exitosa"
     except OperationalError as e:
         return False, f"❌ Error de conexión: {e}"
@@ -36,12 +47,30 @@ def check_database_connection():
         return False, f"❌ Error inesperado: {e}"
 
 
-def get_alembic_status():
-    """Obtener estado de las migraciones de Alembic"""
+@lru_cache(maxsize=1)
+def _script_directory(versions_mtime):
+    """ScriptDirectory de Alembic, reconstruido solo cuando cambia alembic/versions/"""
+    config = Config(str(root_dir / "alembic.ini"))
+    # script_location es relativo al directorio actual: fijarlo a la raíz del proyecto
+    config.set_main_option("script_location", str(root_dir / "alembic"))
+    return ScriptDirectory.from_config(config)
+
+
+def get_script_directory():
+    """Revisiones de Alembic (cacheadas mientras no cambie el directorio de versiones)"""
+    return _script_directory(os.stat(root_dir / "alembic" / "versions").st_mtime_ns)
+
+
+def get_alembic_status(detailed=False):
+    """
+    Obtener estado de las migraciones de Alembic
+    
+    Args:
+        detailed (bool): Incluir la lista de revisiones pendientes (si no, solo el conteo)
+    """
     try:
         # Configurar Alembic
-        alembic_cfg = Config("alembic.ini")
-        script_dir = ScriptDirectory.from_config(alembic_cfg)
+        script_dir = get_script_directory()
         
         with engine.connect() as connection:
             context = MigrationContext.configure(connection)
@@ -52,17 +81,23 @@ def get_alembic_status():
             # Última revisión disponible
             head_rev = script_dir.get_current_head()
             
-            # Revisiones pendientes
+            # Revisiones pendientes (sin recorrer el historial si está al día)
             pending_revs = []
+            pending_count = 0
             if current_rev != head_rev:
-                pending_revs = list(script_dir.walk_revisions(head_rev, current_rev))
+                walk = script_dir.walk_revisions(head_rev, current_rev)
+                if detailed:
+                    pending_revs = [rev.revision for rev in walk]
+                    pending_count = len(pending_revs)
+                else:
+                    pending_count = sum(1 for _ in walk)
             
             return {
                 'status': 'ok',
                 'current_revision': current_rev,
                 'head_revision': head_rev,
-                'pending_count': len(pending_revs),
-                'pending_revisions': [rev.revision for rev in pending_revs],
+                'pending_count': pending_count,
+                'pending_revisions': pending_revs,
                 'up_to_date': current_rev == head_rev
             }
             
@@ -73,8 +108,62 @@ def get_alembic_status():
         }
 
 
-def get_database_info():
-    """Obtener información general de la base de datos"""
+def count_tables_exact(db):
+    """Conteo exacto (COUNT(*)) de las tablas principales"""
+    # Una sola consulta con subconsultas escalares
+    counts = select(*(
+        select(func.count()).select_from(model).scalar_subquery().label(name)
+        for name, model in COUNTED_TABLES.items()
+    ))
+    try:
+        return dict(db.execute(counts).one()._mapping)
+    except Exception:
+        # Alguna tabla no existe (p. ej. migraciones pendientes): contar por separado
+        db.rollback()
+        tables = {}
+        for name, model in COUNTED_TABLES.items():
+            try:
+                tables[name] = db.scalar(select(func.count()).select_from(model))
+            except Exception:
+                db.rollback()
+                tables[name] = 'N/A'
+        return tables
+
+
+def count_tables_estimated(db):
+    """
+    Conteo aproximado desde pg_class.reltuples (mantenido por ANALYZE/autovacuum), sin
+    recorrer las tablas; las que aún no tienen estadísticas se cuentan de forma exacta
+    """
+    names = {name: model.__table__.fullname for name, model in COUNTED_TABLES.items()}
+    estimates = dict(db.execute(
+        text(
+            "SELECT n, (SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(n)) "
+            "FROM unnest(CAST(:names AS text[])) AS n"
+        ),
+        {"names": list(names.values())}
+    ).tuples().all())
+    
+    tables = {}
+    for name, model in COUNTED_TABLES.items():
+        estimate = estimates.get(names[name])
+        if estimate is None:
+            tables[name] = 'N/A'
+        elif estimate >= 0:
+            tables[name] = estimate
+        else:
+            # reltuples = -1: tabla nunca analizada
+            tables[name] = db.scalar(select(func.count()).select_from(model))
+    return tables
+
+
+def get_database_info(exact=False):
+    """
+    Obtener información general de la base de datos
+    
+    Args:
+        exact (bool): Conteo exacto de registros (COUNT(*)) en lugar de la estimación de pg_class
+    """
     try:
         db = SessionLocal()
         
@@ -82,7 +171,8 @@ def get_database_info():
         info = {
             'database_url': settings.DATABASE_URL[:50] + "..." if len(settings.DATABASE_URL) > 50 else settings.DATABASE_URL,
             'tables': {},
-            'schemas': []
+            'schemas': [],
+            'approximate': not exact
         }
         
         # Obtener esquemas
@@ -90,25 +180,7 @@ def get_database_info():
         info['schemas'] = inspector.get_schema_names()
         
         # Contar registros en tablas principales
-        try:
-            info['tables']['usuarios'] = db.query(Usuario).count()
-        except:
-            info['tables']['usuarios'] = 'N/A'
-            
-        try:
-            info['tables']['permisos'] = db.query(Permiso).count()
-        except:
-            info['tables']['permisos'] = 'N/A'
-            
-        try:
-            info['tables']['unidades_organicas'] = db.query(UnidadOrganica).count()
-        except:
-            info['tables']['unidades_organicas'] = 'N/A'
-            
-        try:
-            info['tables']['puestos'] = db.query(Puesto).count()
-        except:
-            info['tables']['puestos'] = 'N/A'
+        info['tables'] = count_tables_exact(db) if exact else count_tables_estimated(db)
         
         db.close()
         return info
@@ -154,7 +226,7 @@ def show_database_status(detailed=False):
     # 2. Estado de migraciones
     print("📊 ESTADO DE MIGRACIONES")
     print("-" * 30)
-    alembic_status = get_alembic_status()
+    alembic_status = get_alembic_status(detailed)
     
     if alembic_status['status'] == 'ok':
         print(f"Revisión actual: {alembic_status['current_revision'] or 'Ninguna'}")
@@ -175,13 +247,13 @@ def show_database_status(detailed=False):
     # 3. Información de la base de datos
     print("🗄️ INFORMACIÓN DE BASE DE DATOS")
     print("-" * 30)
-    db_info = get_database_info()
+    db_info = get_database_info(exact=detailed)
     
     if 'error' not in db_info:
         print(f"URL: {db_info['database_url']}")
         print(f"Esquemas: {', '.join(db_info['schemas'])}")
         print()
-        print("Registros por tabla:")
+        print(f"Registros por tabla{' (aprox.)' if db_info['approximate'] else ''}:")
         for table, count in db_info['tables'].items():
             print(f"  • {table}: {count}")
     else: